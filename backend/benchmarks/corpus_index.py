@@ -0,0 +1,78 @@
+# benchmarks/corpus_index.py
+"""
+Build a synthetic corpus index and time meter / exact / near (k = 1, 2) queries.
+
+Run from backend/:
+    python benchmarks/corpus_index.py [--verses 1000000] [--hot-share 0.5] [--path /tmp/corpus_bench.sqlite3]
+Verses get 2 or 4 padas of 8/11/14/16 random L/G syllables. Uniform random padas are the worst
+case for the pattern vocabulary but the best case for posting lists (each one is short), so a
+--hot-share fraction of verses also gets the same first pada (HOT_PADA, like a common Anuṣṭubh
+pāda in a real corpus). Queries are timed for a random pada, the hot pada and a deep offset.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chandas_analyser.corpus_index import CorpusIndex  # noqa: E402
+
+METERS = ("Anuṣṭubh", "Indravajrā", "Vasantatilakā", "Mandākrāntā", "Unknown / Mixed")
+HOT_PADA = "LGLLGGLG"
+
+
+def _random_verse(rng: random.Random, i: int, hot_share: float = 0.0):
+    length = rng.choice((8, 11, 14, 16))
+    padas = ["".join(rng.choice("LG") for _ in range(length)) for _ in range(rng.choice((2, 4)))]
+    if rng.random() < hot_share:
+        padas[0] = HOT_PADA
+    return {"verse_id": f"v{i}", "padas": padas, "meter": rng.choice(METERS)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verses", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=50_000)
+    parser.add_argument("--path", default="/tmp/corpus_bench.sqlite3")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--hot-share", type=float, default=0.5, help="fraction of verses whose first pada is HOT_PADA")
+    args = parser.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.path + suffix):
+            os.remove(args.path + suffix)
+
+    rng = random.Random(args.seed)
+    index = CorpusIndex(args.path)
+    start = time.perf_counter()
+    for first in range(0, args.verses, args.batch):
+        index.add_verses([_random_verse(rng, i, args.hot_share) for i in range(first, min(first + args.batch, args.verses))])
+    build = time.perf_counter() - start
+    print(f"indexed {args.verses} verses in {build:.1f} s ({args.verses / build:,.0f} verses/s): {index.stats()}")
+
+    sample = _random_verse(rng, -1)["padas"][0]
+    queries = [
+        ("meter", dict(meter="Anuṣṭubh")),
+        ("exact pada", dict(pattern=sample)),
+        ("near pada k=1", dict(pattern=sample, k=1)),
+        ("near pada k=2", dict(pattern=sample, k=2)),
+        ("meter + 2 padas k=1", dict(meter="Anuṣṭubh", pattern=f"{sample}|{sample[::-1]}", k=1)),
+        ("hot pada", dict(pattern=HOT_PADA)),
+        ("hot pada k=1", dict(pattern=HOT_PADA, k=1)),
+        ("hot pada k=2", dict(pattern=HOT_PADA, k=2)),
+        ("hot pada offset=200000", dict(pattern=HOT_PADA, offset=200_000)),
+        ("hot k=1 offset=200000", dict(pattern=HOT_PADA, k=1, offset=200_000)),
+        ("meter + hot pada k=2", dict(meter="Anuṣṭubh", pattern=HOT_PADA, k=2)),
+        ("hot pada + random k=1", dict(pattern=f"{HOT_PADA}|{sample}", k=1)),
+    ]
+    for label, kwargs in queries:
+        start = time.perf_counter()
+        found = index.search(limit=100, **kwargs)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<26}{elapsed * 1000:>9.1f} ms  results={len(found['results'])} hasMore={found['hasMore']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# benchmarks/startup.py
+"""
+Cold-start budget for the backend.
+
+Reports
+  1. import time per module for `import main` (python -X importtime, cumulative microseconds)
+  2. time-to-first-request: spawn `uvicorn main:app`, then time until /health answers and
+     until the first /chandas/analyze (Devanagari, so transliteration runs) succeeds.
+
+Run from backend/:
+    python benchmarks/startup.py [--top 15] [--port 3917] [--budget-ms 1500]
+Exits non-zero if time-to-first-analyze exceeds --budget-ms.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_SHLOKA = "धर्मक्षेत्रे कुरुक्षेत्रे समवेता युयुत्सवः।\nमामकाः पाण्डवाश्चैव किमकुर्वत सञ्जय॥"
+
+# Dependencies that must NOT be imported by `import main` (they load on first use of their endpoint)
+LAZY_MODULES = ("google.oauth2", "google.auth.transport.requests", "google.generativeai",
+                "httpx", "indic_transliteration", "sloka_generator.generator")
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+
+def measure_imports(top: int):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                          cwd=BACKEND_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit("`import main` failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            rows.append((m.group(3), int(m.group(2)), int(m.group(1))))
+
+    total = next((c for n, c, _ in rows if n == "main"), 0)
+    print(f"import main: {total / 1000:.1f} ms")
+    print(f"{'module':<48}{'cumulative ms':>14}{'self ms':>10}")
+    for name, cumulative_us, self_us in sorted(rows, key=lambda r: -r[1])[:top]:
+        print(f"{name:<48}{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}")
+
+    loaded = {n for n, _, _ in rows}
+    eager = [m for m in LAZY_MODULES if m in loaded]
+    if eager:
+        print(f"WARNING: expected lazy modules were imported eagerly: {', '.join(eager)}")
+    return total, eager
+
+
+def _request(url: str, payload=None, timeout: float = 5.0):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.status, resp.read()
+
+
+def measure_first_request(port: int, deadline_s: float = 30.0):
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+                               "--log-level", "warning"], cwd=BACKEND_DIR)
+    try:
+        t_health = None
+        while time.perf_counter() - start < deadline_s:
+            if server.poll() is not None:
+                raise SystemExit("uvicorn exited during startup")
+            try:
+                _request(base + "/health", timeout=0.5)
+                t_health = time.perf_counter() - start
+                break
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.01)
+        if t_health is None:
+            raise SystemExit(f"server did not answer /health within {deadline_s:.0f}s")
+
+        t0 = time.perf_counter()
+        status, _ = _request(base + "/chandas/analyze", {"shloka": SAMPLE_SHLOKA})
+        t_first_analyze = time.perf_counter() - start
+        t_analyze_only = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        _request(base + "/chandas/analyze", {"shloka": SAMPLE_SHLOKA})
+        t_warm_analyze = time.perf_counter() - t0
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    print(f"time to first /health:          {t_health * 1000:.1f} ms")
+    print(f"time to first /chandas/analyze: {t_first_analyze * 1000:.1f} ms "
+          f"(request itself {t_analyze_only * 1000:.1f} ms, status {status})")
+    print(f"warm /chandas/analyze:          {t_warm_analyze * 1000:.1f} ms")
+    return t_first_analyze
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    parser.add_argument("--port", type=int, default=3917)
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if time-to-first-analyze exceeds this")
+    parser.add_argument("--imports-only", action="store_true", help="skip spawning uvicorn")
+    args = parser.parse_args()
+
+    _, eager = measure_imports(args.top)
+    if args.imports_only:
+        return 1 if eager else 0
+
+    print()
+    t_first = measure_first_request(args.port)
+    if args.budget_ms is not None and t_first * 1000 > args.budget_ms:
+        print(f"FAIL: time-to-first-analyze {t_first * 1000:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        return 1
+    return 1 if eager else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+# benchmarks/transliteration.py
+"""
+Differential check and throughput benchmark for chandas_analyser.transliteration.
+
+1. Differential: runs devanagari_to_iast / iast_to_devanagari and sanscript.transliterate on a
+   generated corpus and requires byte-identical output. The corpus mixes well-formed verses
+   (akṣaras, conjuncts, dandas, "om"), IAST round trips in lower / title / upper case, random
+   strings over every table key plus Vedic accents, ZWJ / ZWNJ, digits and punctuation, and
+   random code points from the Devanagari, Vedic Extensions and Latin Extended blocks.
+2. Throughput: characters per second for both directions, library vs fast path, on verses.
+
+Run from backend/:
+    python benchmarks/transliteration.py [--cases 200000] [--seed 7] [--repeat 3]
+Exits non-zero on any mismatch.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indic_transliteration import sanscript  # noqa: E402
+
+from chandas_analyser import translit_tables as tables  # noqa: E402
+from chandas_analyser.transliteration import devanagari_to_iast, iast_to_devanagari  # noqa: E402
+
+CONSONANTS = [t for t, (_, _, is_consonant) in tables.DEVA_IAST_TOKENS.items() if is_consonant]
+VOWELS = "अआइईउऊऋॠऌएऐओऔ"
+MARKS = ["", "", "", "ा", "ि", "ी", "ु", "ू", "ृ", "ॄ", "े", "ै", "ो", "ौ"]
+TAILS = ["", "", "", "", "ं", "ः", "्", "ँ"]
+PUNCT = [" ", " ", " ", "।", "॥", "\n", ",", ".", "-", "|", "'", "ऽ", "१२", "ॐ ", "ओं ", "ओम् "]
+EXTRA = list("‌‍0123456789 .,;:!?-'\"()[]{}|/\\\tabcxyzABCXYZ~^_") + ["ॐ", "ऽ"]
+EDGE_CASES = ["", "a", "k", "क", "क्", "om", "oṃ", "Om", "OṂ", " om.", "(oṃ)", "_om_", "oṃ।", "hom", "oṃkāra",
+              "ओं", "ओम्", "।ओं॥", "कओं", "ॐ नमः", "agním īḷe", "á", "r̥̄", "क़ ख़ ग़", "क्‍ष", "क्‌ष", "ज्ञ"]
+RANDOM_BLOCKS = ((0x0900, 0x097F), (0x1CD0, 0x1CFF), (0xA8E0, 0xA8FF), (0x0100, 0x017F),
+                 (0x1E00, 0x1EFF), (0x0300, 0x036F), (0x0020, 0x007E))
+
+
+def _verse(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(4, 40)):
+        r = rng.random()
+        if r < 0.08:
+            parts.append(rng.choice(VOWELS) + rng.choice(TAILS))
+        elif r < 0.16:
+            parts.append(rng.choice(PUNCT))
+        else:
+            cluster = rng.choice(CONSONANTS)
+            if rng.random() < 0.2:
+                cluster += "्" + rng.choice(CONSONANTS)
+            parts.append(cluster + rng.choice(MARKS) + rng.choice(TAILS))
+    return "".join(parts)
+
+
+def _iast_variants(rng: random.Random, deva: str):
+    iast = sanscript.transliterate(deva, sanscript.DEVANAGARI, sanscript.IAST)
+    yield iast
+    yield iast.title()
+    if rng.random() < 0.2:
+        yield iast.upper()
+
+
+def _random_string(rng: random.Random, alphabet) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 24)))
+
+
+def _random_code_points(rng: random.Random) -> str:
+    out = []
+    for _ in range(rng.randint(1, 16)):
+        lo, hi = rng.choice(RANDOM_BLOCKS)
+        out.append(chr(rng.randint(lo, hi)))
+    return "".join(out)
+
+
+def corpus(cases: int, seed: int):
+    """Yield (direction, text) pairs; direction is 'd2i' or 'i2d'."""
+    for text in EDGE_CASES:
+        yield "d2i", text
+        yield "i2d", text
+    rng = random.Random(seed)
+    deva_alphabet = list(tables.DEVA_IAST_TOKENS) + list(tables.DEVA_IAST_ACCENTS) + EXTRA
+    iast_alphabet = list(tables.IAST_DEVA_TOKENS) + list(tables.IAST_DEVA_ACCENTS) + EXTRA + list(" aAmM")
+    for n in range(cases):
+        kind = n % 5
+        if kind == 0:
+            deva = _verse(rng)
+            yield "d2i", deva
+            for iast in _iast_variants(rng, deva):
+                yield "i2d", iast
+        elif kind == 1:
+            yield "d2i", _random_string(rng, deva_alphabet)
+        elif kind == 2:
+            yield "i2d", _random_string(rng, iast_alphabet)
+        else:
+            text = _random_code_points(rng)
+            yield "d2i", text
+            yield "i2d", text
+
+
+def differential(cases: int, seed: int) -> int:
+    fast = {"d2i": devanagari_to_iast, "i2d": iast_to_devanagari}
+    schemes = {"d2i": (sanscript.DEVANAGARI, sanscript.IAST), "i2d": (sanscript.IAST, sanscript.DEVANAGARI)}
+    checked, mismatches = 0, []
+    for direction, text in corpus(cases, seed):
+        expected = sanscript.transliterate(text, *schemes[direction])
+        got = fast[direction](text)
+        checked += 1
+        if got.encode("utf-8") != expected.encode("utf-8"):
+            mismatches.append((direction, text, expected, got))
+    print(f"differential: {checked} strings, {len(mismatches)} mismatches "
+          f"(tables from indic-transliteration {tables.LIBRARY_VERSION})")
+    for direction, text, expected, got in mismatches[:20]:
+        print(f"  {direction} {text!r}: library {expected!r}, fast {got!r}")
+    return len(mismatches)
+
+
+def _rate(fn, texts, repeat: int) -> float:
+    chars = sum(len(t) for t in texts)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for t in texts:
+            fn(t)
+        best = min(best, time.perf_counter() - start)
+    return chars / best
+
+
+def throughput(seed: int, repeat: int) -> None:
+    rng = random.Random(seed)
+    deva = [_verse(rng) for _ in range(20_000)]
+    iast = [sanscript.transliterate(t, sanscript.DEVANAGARI, sanscript.IAST) for t in deva]
+    rows = [
+        ("devanagari -> iast", deva, lambda t: sanscript.transliterate(t, sanscript.DEVANAGARI, sanscript.IAST),
+         devanagari_to_iast),
+        ("iast -> devanagari", iast, lambda t: sanscript.transliterate(t, sanscript.IAST, sanscript.DEVANAGARI),
+         iast_to_devanagari),
+    ]
+    print(f"{'direction':<20}{'library chars/s':>18}{'fast chars/s':>16}{'speedup':>10}")
+    for label, texts, library_fn, fast_fn in rows:
+        lib = _rate(library_fn, texts, repeat)
+        fast = _rate(fast_fn, texts, repeat)
+        print(f"{label:<20}{lib:>18,.0f}{fast:>16,.0f}{fast / lib:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check-only", action="store_true", help="skip the throughput benchmark")
+    args = parser.parse_args()
+
+    failures = differential(args.cases, args.seed)
+    if not args.check_only:
+        print()
+        throughput(args.seed, args.repeat)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+# app/catalog.py
+"""
+Compiled binary snapshot of chandas_db.json.
+
+chandas_db.json stays the source of truth. `python -m chandas_analyser.catalog` compiles it
+into chandas_db.bin, which workers memory-map read-only: every uvicorn worker shares the same
+page-cache copy and opening it costs the same regardless of catalog size (entries are decoded
+on first access). Opening only checks the header: format, body length, and the size / mtime of
+chandas_db.json recorded at build time. Each record carries a crc32 of its own bytes (record,
+padas, strings), checked the first time the entry is decoded; a mismatch raises
+CatalogCorruptError and the file is refused by open_catalog until it changes. The whole-body
+checksum is verified by the build step and by `python -m chandas_analyser.catalog --verify`.
+
+Layout (little-endian):
+  header   magic, version, count, section offsets, body length, crc32 of the body,
+           size / mtime_ns / sha256 of the source JSON
+  records  one fixed-size record per entry (name/pattern/template/rules offsets,
+           syllables_per_pada, pada count, offset of its padas in the pada section, crc32)
+  padas    per pada: u16 syllable count + packed bits (G = 1, LSB first)
+  strings  UTF-8 name table, raw patterns, templates (pattern_regex) and rules (JSON)
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import zlib
+from typing import List, Dict, Any, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger("chandas_analyser.catalog")
+
+MAGIC = b"VEDACAT\0"
+FORMAT_VERSION = 4
+
+_HEADER = struct.Struct("<8sHHIIIIIQQ32s")   # magic, version, reserved, count, padas_start, strings_start, body_len,
+                                              # crc32, source size, source mtime_ns, source sha256
+_RECORD = struct.Struct("<IHIHIHIHHHII")  # name/pattern/tmpl/rules (off, len), syllables_per_pada, pada_count, padas_off,
+                                           # crc32 of the record fields before it, its padas and its strings
+_RECORD_CRC_OFFSET = _RECORD.size - 4
+_PADA_LEN = struct.Struct("<H")
+
+# (device, inode, size, mtime_ns) of compiled files that failed a record checksum in this process
+_corrupt_files: Set[Tuple[int, int, int, int]] = set()
+
+
+class CatalogCorruptError(ValueError):
+    """A record of the compiled catalog does not match its checksum."""
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCE = os.path.join(CURRENT_DIR, "chandas_db.json")
+DEFAULT_COMPILED = os.path.join(CURRENT_DIR, "chandas_db.bin")
+
+
+def _pack_pada(pada: str) -> bytes:
+    bits = 0
+    for i, ch in enumerate(pada):
+        if ch == "G":
+            bits |= 1 << i
+    return _PADA_LEN.pack(len(pada)) + bits.to_bytes((len(pada) + 7) // 8, "little")
+
+
+def _record_crc(fields: bytes, padas: bytes, strings) -> int:
+    crc = zlib.crc32(padas, zlib.crc32(fields))
+    for data in strings:
+        crc = zlib.crc32(data, crc)
+    return crc
+
+
+def compile_catalog(source_path: str = DEFAULT_SOURCE, out_path: str = DEFAULT_COMPILED) -> int:
+    """
+    Compile the JSON catalog into the binary snapshot. Returns the number of entries written.
+    Normalization is the same one load_chandas_local applies to the JSON.
+    """
+    from chandas_analyser.local_loader import _normalize_item
+    from chandas_analyser.matcher import _normalize_pattern_to_padas
+
+    source_stat = os.stat(source_path)
+    with open(source_path, "rb") as f:
+        source_bytes = f.read()
+    raw = json.loads(source_bytes.decode("utf-8"))
+    items = raw if isinstance(raw, list) else raw.get("data", [])
+    entries = [_normalize_item(item) for item in items]
+
+    strings = bytearray()
+    padas_blob = bytearray()
+    records = bytearray()
+
+    def add_string(s: str):
+        data = s.encode("utf-8")
+        off = len(strings)
+        strings.extend(data)
+        return off, len(data)
+
+    for e in entries:
+        name_off, name_len = add_string(str(e["name"]))
+        pat_off, pat_len = add_string(str(e["pattern"]))
+        tmpl_off, tmpl_len = add_string(str(e.get("pattern_regex") or ""))
+        rules_off, rules_len = add_string(json.dumps(e["rules"], ensure_ascii=False) if e.get("rules") else "")
+        padas = _normalize_pattern_to_padas(e["pattern"])
+        sp_p = e.get("syllables_per_pada")
+        sp_p = sp_p if isinstance(sp_p, int) and 0 <= sp_p <= 0xFFFF else 0
+        packed = b"".join(_pack_pada(p) for p in padas)
+        fields = (name_off, name_len, pat_off, pat_len, tmpl_off, tmpl_len, rules_off, rules_len, sp_p, len(padas), len(padas_blob))
+        record_crc = _record_crc(_RECORD.pack(*fields, 0)[:_RECORD_CRC_OFFSET], packed,
+                                 [strings[off:off + length] for off, length in zip(fields[0:8:2], fields[1:8:2])])
+        records.extend(_RECORD.pack(*fields, record_crc))
+        padas_blob.extend(packed)
+
+    padas_start = _HEADER.size + len(records)
+    strings_start = padas_start + len(padas_blob)
+    body = bytes(records) + bytes(padas_blob) + bytes(strings)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(entries), padas_start, strings_start, len(body),
+                          zlib.crc32(body), source_stat.st_size, source_stat.st_mtime_ns,
+                          hashlib.sha256(source_bytes).digest())
+
+    # Write then rename so workers never map a half-written file
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp_path, out_path)
+
+    logger.info("Compiled %d chandas from %s into %s (%d bytes)", len(entries), source_path, out_path, len(header) + len(body))
+    return len(entries)
+
+
+class CompiledCatalog(Sequence[Dict[str, Any]]):
+    """
+    Read-only view over a memory-mapped chandas_db.bin.
+    Behaves like the list returned by load_chandas_local: items are the same normalized dicts.
+    """
+
+    def __init__(self, mm: mmap.mmap, file_key: Tuple[int, int, int, int]):
+        self._mm = mm
+        self._file_key = file_key
+        (_, _, _, self._count, self._padas_start, self._strings_start, _, self._crc, _, _, source_sha) = _HEADER.unpack_from(mm, 0)
+        self.source_sha256 = source_sha.hex()
+        self._decoded: Dict[int, Dict[str, Any]] = {}
+        self._decoded_padas: Dict[int, List[str]] = {}
+        self._checked: Set[int] = set()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def corrupt(self) -> bool:
+        """True once any record of this file failed its checksum."""
+        return self._file_key in _corrupt_files
+
+    def close(self) -> None:
+        """Unmap the file. Entries not decoded yet can no longer be read."""
+        self._mm.close()
+
+    def _record(self, index: int) -> tuple:
+        """Unpack record 'index', checking its crc32 the first time it is read."""
+        pos = _HEADER.size + index * _RECORD.size
+        record = _RECORD.unpack_from(self._mm, pos)
+        if index in self._checked:
+            return record
+        pada_count, padas_off, record_crc = record[9:12]
+        start = end = self._padas_start + padas_off
+        for _ in range(pada_count):
+            if end + _PADA_LEN.size > self._strings_start:
+                break
+            (length,) = _PADA_LEN.unpack_from(self._mm, end)
+            end += _PADA_LEN.size + (length + 7) // 8
+        strings = [self._mm[self._strings_start + off:self._strings_start + off + length]
+                   for off, length in zip(record[0:8:2], record[1:8:2])]
+        if end > self._strings_start or _record_crc(self._mm[pos:pos + _RECORD_CRC_OFFSET], self._mm[start:end], strings) != record_crc:
+            _corrupt_files.add(self._file_key)
+            logger.error("Compiled catalog record %d failed its checksum; the file will be ignored until rebuilt.", index)
+            raise CatalogCorruptError(f"compiled catalog record {index} failed its checksum")
+        self._checked.add(index)
+        return record
+
+    def verify(self) -> bool:
+        """Full crc32 of the body (reads every page; not done on open)."""
+        with memoryview(self._mm) as view, view[_HEADER.size:] as body:
+            return zlib.crc32(body) == self._crc
+
+    def _string(self, off: int, length: int) -> str:
+        start = self._strings_start + off
+        return self._mm[start:start + length].decode("utf-8")
+
+    def pada_patterns(self, index: int) -> List[str]:
+        """Decode the packed padas of entry 'index' to compact 'L'/'G' strings."""
+        cached = self._decoded_padas.get(index)
+        if cached is not None:
+            return cached
+        pada_count, padas_off = self._record(index)[9:11]
+        pos = self._padas_start + padas_off
+        out = []
+        for _ in range(pada_count):
+            (length,) = _PADA_LEN.unpack_from(self._mm, pos)
+            pos += _PADA_LEN.size
+            nbytes = (length + 7) // 8
+            bits = int.from_bytes(self._mm[pos:pos + nbytes], "little")
+            pos += nbytes
+            out.append("".join("G" if (bits >> i) & 1 else "L" for i in range(length)))
+        self._decoded_padas[index] = out
+        return out
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("catalog index out of range")
+
+        item = self._decoded.get(index)
+        if item is None:
+            name_off, name_len, pat_off, pat_len, tmpl_off, tmpl_len, rules_off, rules_len, sp_p, _, _, _ = self._record(index)
+            item = {
+                "name": self._string(name_off, name_len),
+                "pattern": self._string(pat_off, pat_len),
+                "pattern_regex": self._string(tmpl_off, tmpl_len),
+                "syllables_per_pada": sp_p,
+                "rules": json.loads(self._string(rules_off, rules_len)) if rules_len else None
+            }
+            self._decoded[index] = item
+        return item
+
+
+def open_catalog(compiled_path: str = DEFAULT_COMPILED, source_path: Optional[str] = DEFAULT_SOURCE) -> Optional[CompiledCatalog]:
+    """
+    Map the compiled catalog read-only. Returns None (callers fall back to the JSON) if the file
+    is missing, truncated, of another format, stale (chandas_db.json size or mtime differs
+    from the build), or already failed a record checksum in this process. Cost is independent
+    of catalog size; records are checked as they are decoded (see CompiledCatalog._record).
+    """
+    if not os.path.exists(compiled_path):
+        return None
+
+    try:
+        with open(compiled_path, "rb") as f:
+            st = os.fstat(f.fileno())
+            file_key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+            if file_key in _corrupt_files:
+                logger.warning("Compiled catalog %s failed a checksum; re-run `python -m chandas_analyser.catalog`.", compiled_path)
+                return None
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        logger.warning("Could not map compiled catalog %s: %s", compiled_path, e)
+        return None
+
+    problem = _header_problem(mm, source_path)
+    if problem:
+        mm.close()
+        logger.warning("Compiled catalog %s %s; ignoring it.", compiled_path, problem)
+        return None
+    return CompiledCatalog(mm, file_key)
+
+
+def _header_problem(mm: mmap.mmap, source_path: Optional[str]) -> Optional[str]:
+    if len(mm) < _HEADER.size:
+        return "is truncated"
+    magic, version, _, _, _, _, body_len, _, source_size, source_mtime_ns, _ = _HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return "has unknown format"
+    if len(mm) != _HEADER.size + body_len:
+        return "is truncated"
+    if source_path and os.path.exists(source_path):
+        st = os.stat(source_path)
+        if (st.st_size, st.st_mtime_ns) != (source_size, source_mtime_ns):
+            return f"is stale vs {source_path} (re-run `python -m chandas_analyser.catalog`)"
+    return None
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = sys.argv[1:]
+    if args[:1] == ["--verify"]:
+        catalog = open_catalog(args[1] if len(args) > 1 else DEFAULT_COMPILED, None)
+        ok = catalog is not None and catalog.verify()
+        logger.info("Compiled catalog checksum %s", "OK" if ok else "FAILED")
+        sys.exit(0 if ok else 1)
+    src = args[0] if len(args) > 0 else DEFAULT_SOURCE
+    dst = args[1] if len(args) > 1 else DEFAULT_COMPILED
+    compile_catalog(src, dst)
+    if not open_catalog(dst, src).verify():
+        sys.exit("compiled catalog failed its checksum")
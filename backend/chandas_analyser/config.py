@@ -7,3 +7,10 @@ LOCAL_DB = PROJECT_ROOT / "chandas_db.json"
 
 # similarity threshold for matcher (same as before)
 SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", "0.65"))
+
+# optional host-wide result cache shared by all workers (SQLite file path; empty = disabled)
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", "")
+SHARED_CACHE_MAX_ENTRIES = int(os.getenv("SHARED_CACHE_MAX_ENTRIES", "50000"))
+
+# persistent inverted index for corpus search (SQLite file)
+CORPUS_INDEX_PATH = os.getenv("CORPUS_INDEX_PATH", str(PROJECT_ROOT / "corpus_index.sqlite3"))
@@ -0,0 +1,310 @@
+# app/corpus_index.py
+"""
+Persistent inverted index over analyzed corpora.
+
+Maps pada LG patterns (from get_lg_pattern) and identified meters (from find_match_in_db) to verse
+IDs, so "all verses in meter X" or "all verses containing pada P (within edit distance k)" does
+not re-run the analyzer. Stored in a local SQLite file (WAL) so every worker shares it and appends
+are incremental:
+
+  verses    (id, verse_id, meter, pattern, text)          -- meter indexed
+  patterns  (id, pattern, length, guru)                   -- distinct pada patterns, (length, guru) indexed
+  postings  (pattern_id, verse_rowid, pada)               -- clustered by pattern_id
+
+Near search only scores vocabulary patterns whose length and guru/laghu counts are within k of the
+query (edit distance can't be smaller than those differences), with a bit-parallel edit distance.
+
+Queries never materialize a whole posting list: the most selective condition (a query pada or the
+meter) drives the scan, each of its patterns' postings is read in verse order straight from the
+primary key, the other conditions are probed per candidate verse, and the scan stops once the
+requested page is full. Searches use a read connection per thread, so they run concurrently.
+"""
+import heapq
+import logging
+import sqlite3
+import threading
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+from chandas_analyser.config import CORPUS_INDEX_PATH
+from chandas_analyser.sqlite_store import open_wal_db
+
+logger = logging.getLogger("chandas_analyser.corpus_index")
+
+MAX_NEAR_K = 3
+MAX_APPEND_VERSES = 1000   # per POST /corpus/verses request
+# Posting counts are only compared up to this many rows when picking the driving condition
+_SELECTIVITY_CAP = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verses (
+    id       INTEGER PRIMARY KEY,
+    verse_id TEXT NOT NULL UNIQUE,
+    meter    TEXT NOT NULL,
+    pattern  TEXT NOT NULL,
+    text     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS verses_meter ON verses (meter, id);
+CREATE TABLE IF NOT EXISTS patterns (
+    id      INTEGER PRIMARY KEY,
+    pattern TEXT NOT NULL UNIQUE,
+    length  INTEGER NOT NULL,
+    guru    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    pattern_id  INTEGER NOT NULL,
+    verse_rowid INTEGER NOT NULL,
+    pada        INTEGER NOT NULL,
+    PRIMARY KEY (pattern_id, verse_rowid, pada)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_verse ON postings (verse_rowid);
+"""
+
+
+def _bounded_distance(peq: Dict[str, int], m: int, text: str, k: int) -> int:
+    """
+    Levenshtein distance between the query (given as its Peq bitmasks and length m) and 'text',
+    using Myers/Hyyrö bit-parallel DP. Stops early and returns k + 1 once the distance must exceed k.
+    """
+    n = len(text)
+    if m == 0:
+        return n if n <= k else k + 1
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for j, ch in enumerate(text):
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & full
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # each remaining column can lower the score by at most one
+        if score - (n - j - 1) > k:
+            return k + 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+    return score if score <= k else k + 1
+
+
+def _peq(pattern: str) -> Dict[str, int]:
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    return peq
+
+
+def _normalize_pada(pattern: str) -> str:
+    return "".join(ch for ch in str(pattern).upper() if ch in ("L", "G"))
+
+
+class CorpusIndex:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = open_wal_db(path, _SCHEMA)
+        self._readers = threading.local()
+        # In-memory copy of the pattern vocabulary, refreshed incrementally (other workers may append)
+        self._vocab_ids: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[int, int], List[Tuple[int, str]]] = {}
+        self._vocab_max_id = 0
+
+    def _reader(self) -> sqlite3.Connection:
+        """This thread's read connection (WAL readers do not block each other or the writer)."""
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("CREATE TEMP TABLE query_patterns (slot INTEGER, pattern_id INTEGER)")
+            self._readers.conn = conn
+        return conn
+
+    def _refresh_vocab(self) -> None:
+        rows = self._conn.execute(
+            "SELECT id, pattern, length, guru FROM patterns WHERE id > ? ORDER BY id", (self._vocab_max_id,)).fetchall()
+        for pid, pattern, length, guru in rows:
+            self._vocab_ids[pattern] = pid
+            self._buckets.setdefault((length, guru), []).append((pid, pattern))
+            self._vocab_max_id = pid
+
+    def _pattern_id(self, pattern: str) -> int:
+        pid = self._vocab_ids.get(pattern)
+        if pid is None:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO patterns (pattern, length, guru) VALUES (?, ?, ?)",
+                (pattern, len(pattern), pattern.count("G")))
+            (pid,) = self._conn.execute("SELECT id FROM patterns WHERE pattern = ?", (pattern,)).fetchone()
+        return pid
+
+    # ---------------- writes ----------------
+    def add_verses(self, verses: Sequence[Dict[str, Any]]) -> int:
+        """
+        Append (or replace, by verse_id) analyzed verses. Each item needs
+        'verse_id', 'padas' (get_lg_pattern output), 'meter' and optionally 'text'.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._refresh_vocab()
+                for v in verses:
+                    padas = [_normalize_pada(p) for p in v["padas"]]
+                    verse_id = str(v["verse_id"])
+                    old = self._conn.execute("SELECT id FROM verses WHERE verse_id = ?", (verse_id,)).fetchone()
+                    if old:
+                        self._conn.execute("DELETE FROM postings WHERE verse_rowid = ?", (old[0],))
+                        self._conn.execute("DELETE FROM verses WHERE id = ?", (old[0],))
+                    cur = self._conn.execute(
+                        "INSERT INTO verses (verse_id, meter, pattern, text) VALUES (?, ?, ?, ?)",
+                        (verse_id, v.get("meter") or "Unknown", "|".join(padas), v.get("text") or ""))
+                    rowid = cur.lastrowid
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO postings (pattern_id, verse_rowid, pada) VALUES (?, ?, ?)",
+                        [(self._pattern_id(p), rowid, i) for i, p in enumerate(padas) if p])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._refresh_vocab()
+        logger.info("Corpus index: appended %d verses", len(verses))
+        return len(verses)
+
+    # ---------------- queries ----------------
+    def _matching_patterns(self, query: str, k: int) -> Dict[int, int]:
+        """pattern_id -> distance for every vocabulary pattern within edit distance k of 'query'."""
+        if k <= 0:
+            pid = self._vocab_ids.get(query)
+            return {pid: 0} if pid is not None else {}
+
+        n, g = len(query), query.count("G")
+        peq, out = _peq(query), {}
+        for length in range(max(0, n - k), n + k + 1):
+            for guru in range(max(0, g - k), g + k + 1):
+                if abs((length - guru) - (n - g)) > k:
+                    continue
+                for pid, pattern in self._buckets.get((length, guru), ()):
+                    d = _bounded_distance(peq, n, pattern, k)
+                    if d <= k:
+                        out[pid] = d
+        return out
+
+    def search(self, meter: Optional[str] = None, pattern: Optional[str] = None, k: int = 0,
+               limit: int = 100, offset: int = 0) -> Dict[str, Any]:
+        """
+        Verses in 'meter' and/or containing every pada of 'pattern' ('|'-separated, any position)
+        within edit distance k per pada. Results are ordered by insertion.
+        """
+        k = int(k)
+        if not 0 <= k <= MAX_NEAR_K:
+            raise ValueError(f"'k' must be between 0 and {MAX_NEAR_K}.")
+        query_padas = [_normalize_pada(p) for p in (pattern or "").split("|")]
+        query_padas = [p for p in query_padas if p]
+        if not meter and not query_padas:
+            raise ValueError("Provide 'meter' and/or 'pattern' to search.")
+
+        with self._lock:
+            self._refresh_vocab()
+        # the vocabulary is only ever appended to, so it can be read without the lock
+        matches = [self._matching_patterns(p, k) for p in query_padas]
+        if any(not m for m in matches):
+            return {"results": [], "hasMore": False}
+
+        conn = self._reader()
+        conn.execute("BEGIN")   # one snapshot for the scan and the row fetch
+        try:
+            ids = self._hit_ids(conn, meter, matches, limit + 1, offset)
+            rows = conn.execute(
+                f"SELECT id, verse_id, meter, pattern, text FROM verses WHERE id IN ({','.join('?' * len(ids))}) "
+                "ORDER BY id", ids).fetchall() if ids else []
+        finally:
+            conn.execute("COMMIT")
+
+        distances = {pid: d for m in matches for pid, d in m.items()}
+        results = []
+        for _, verse_id, v_meter, v_pattern, text in rows[:limit]:
+            padas = v_pattern.split("|") if v_pattern else []
+            matched = [{"pada": i, "pattern": p, "distance": distances[self._vocab_ids[p]]}
+                       for i, p in enumerate(padas)
+                       if p in self._vocab_ids and self._vocab_ids[p] in distances]
+            results.append({"verseId": verse_id, "meter": v_meter, "pattern": v_pattern,
+                            "text": text, "matchedPadas": matched})
+        return {"results": results, "hasMore": len(rows) > limit}
+
+    @staticmethod
+    def _hit_ids(conn: sqlite3.Connection, meter: Optional[str], matches: List[Dict[int, int]],
+                 count: int, offset: int) -> List[int]:
+        """Ids of matching verses 'offset' .. 'offset + count' in id order."""
+        if not matches:
+            # meter only: walk the (meter, id) index directly
+            return [vid for (vid,) in conn.execute(
+                "SELECT id FROM verses WHERE meter = ? ORDER BY id LIMIT ? OFFSET ?", (meter, count, offset))]
+
+        conn.execute("DELETE FROM query_patterns")
+        for slot, m in enumerate(matches):
+            conn.executemany("INSERT INTO query_patterns (slot, pattern_id) VALUES (?, ?)", [(slot, pid) for pid in m])
+        probe = ("EXISTS (SELECT 1 FROM postings p WHERE p.verse_rowid = {vid} AND p.pattern_id IN "
+                 "(SELECT pattern_id FROM query_patterns WHERE slot = ?))")
+
+        sizes = [conn.execute(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM postings WHERE pattern_id IN "
+            "(SELECT pattern_id FROM query_patterns WHERE slot = ?) LIMIT ?)", (slot, _SELECTIVITY_CAP)).fetchone()[0]
+            for slot in range(len(matches))]
+        driver = min(range(len(matches)), key=sizes.__getitem__)
+        if meter:
+            (meter_size,) = conn.execute("SELECT COUNT(*) FROM (SELECT 1 FROM verses WHERE meter = ? LIMIT ?)",
+                                         (meter, _SELECTIVITY_CAP)).fetchone()
+            if meter_size <= sizes[driver]:
+                # the meter drives: one ordered walk of (meter, id), every pada probed per verse
+                sql = (f"SELECT v.id FROM verses v WHERE v.meter = ? "
+                       f"{''.join(' AND ' + probe.format(vid='v.id') for _ in matches)} ORDER BY v.id LIMIT ? OFFSET ?")
+                return [vid for (vid,) in conn.execute(sql, [meter, *range(len(matches)), count, offset])]
+
+        # A query pada drives: the postings of each of its patterns stream in verse order from the
+        # primary key and are merged; other padas (and the meter) are probed per candidate verse
+        others = [slot for slot in range(len(matches)) if slot != driver]
+        where = ["d.pattern_id = ?"] + [probe.format(vid="d.verse_rowid") for _ in others]
+        if meter:
+            where.append("(SELECT meter FROM verses WHERE id = d.verse_rowid) = ?")
+        sql = f"SELECT d.verse_rowid FROM postings d WHERE {' AND '.join(where)} ORDER BY d.verse_rowid"
+        tail = others + ([meter] if meter else [])
+        cursors = [conn.execute(sql, [pid, *tail]) for pid in matches[driver]]
+        try:
+            ids: List[int] = []
+            last, skipped = None, 0
+            for (vid,) in heapq.merge(*cursors):
+                if vid == last:
+                    continue   # several padas of one verse matched
+                last = vid
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                ids.append(vid)
+                if len(ids) >= count:
+                    break
+            return ids
+        finally:
+            for cur in cursors:
+                cur.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (verses,) = self._conn.execute("SELECT COUNT(*) FROM verses").fetchone()
+            (patterns,) = self._conn.execute("SELECT COUNT(*) FROM patterns").fetchone()
+        return {"path": self.path, "verses": verses, "distinctPadaPatterns": patterns}
+
+
+_corpus_index: Optional[CorpusIndex] = None
+_corpus_index_lock = threading.Lock()
+
+
+def get_corpus_index() -> CorpusIndex:
+    """Process-wide index instance (opened on first use; callers may be worker threads)."""
+    global _corpus_index
+    if _corpus_index is None:
+        with _corpus_index_lock:
+            if _corpus_index is None:
+                _corpus_index = CorpusIndex(CORPUS_INDEX_PATH)
+                logger.info("Corpus index opened at %s", CORPUS_INDEX_PATH)
+    return _corpus_index
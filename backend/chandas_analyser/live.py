@@ -0,0 +1,93 @@
+# app/live.py
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+from chandas_analyser.syllabifier import split_padas, pada_lg_pattern
+from chandas_analyser.matcher import find_match_in_db
+
+logger = logging.getLogger("chandas_analyser.live")
+
+# Upper bound on memoized (input pada, DB pada) distances kept per connection.
+MAX_DIST_CACHE_ENTRIES = 4096
+
+
+class LiveAnalysisSession:
+    """
+    Per-connection state for as-you-type analysis.
+    - Keeps the current text, its padas and their LG patterns.
+    - On every update only padas whose text changed are re-syllabified.
+    - Per-pada distances are memoized, so re-scoring candidates only pays for changed padas.
+    """
+
+    def __init__(self, max_cache_entries: int = MAX_DIST_CACHE_ENTRIES):
+        self.text = ""
+        self.revision = 0
+        self._pada_texts: List[str] = []
+        self._pada_patterns: List[str] = []
+        self._dist_cache: Dict[Tuple[str, str], int] = {}
+        self._max_cache_entries = max_cache_entries
+        self._last_db: Optional[List[Dict[str, Any]]] = None
+        self._last_match: Optional[Dict[str, Any]] = None
+
+    def apply_edit(self, start: int, end: int, insert: str) -> str:
+        """
+        Splice 'insert' into the current text over [start, end) and return the new text.
+        Offsets are clamped to the current text so a stale client cannot raise.
+        """
+        n = len(self.text)
+        start = max(0, min(int(start), n))
+        end = max(start, min(int(end), n))
+        return self.text[:start] + (insert or "") + self.text[end:]
+
+    def keep_text(self, text: str) -> None:
+        """Track the client's text without analysing it (e.g. it failed validation)."""
+        self.text = text
+
+    def update(self, text: str, db_chandas: List[Dict[str, Any]], analyzed_text: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Replace the session text and return the refreshed analysis.
+        'analyzed_text' is the validated/cleaned form to analyze; defaults to 'text'.
+        """
+        new_texts = split_padas(text if analyzed_text is None else analyzed_text)
+
+        # Reuse patterns by pada text (not index) so inserting/removing a line keeps the rest warm
+        known = dict(zip(self._pada_texts, self._pada_patterns))
+        new_patterns: List[str] = []
+        for pada in new_texts:
+            pat = known.get(pada)
+            if pat is None:
+                pat = pada_lg_pattern(pada)
+            new_patterns.append(pat)
+
+        changed = [i for i, pat in enumerate(new_patterns)
+                   if i >= len(self._pada_patterns) or self._pada_patterns[i] != pat]
+        patterns_changed = bool(changed) or len(new_patterns) != len(self._pada_patterns)
+
+        self.text = text
+        self._pada_texts = new_texts
+        self._pada_patterns = new_patterns
+        self.revision += 1
+
+        if patterns_changed or db_chandas is not self._last_db or self._last_match is None:
+            if len(self._dist_cache) > self._max_cache_entries:
+                self._dist_cache.clear()
+            self._last_match = find_match_in_db(new_patterns, db_chandas, dist_cache=self._dist_cache, with_alignment=True)
+            self._last_db = db_chandas
+
+        match = self._last_match
+        logger.debug("Live rev=%d changed=%s patterns=%s", self.revision, changed, new_patterns)
+
+        return {
+            "revision": self.revision,
+            "changedPadas": changed,
+            "pattern": {
+                "byPada": new_patterns,
+                "combined_compact": "".join(new_patterns),
+                "combined_by_pada": "|".join(new_patterns)
+            },
+            "identifiedChandas": match.get("identifiedChandas"),
+            "similarity": match.get("similarity"),
+            "matchedPattern": match.get("matchedPattern"),
+            "explanation": match.get("explanation"),
+            "alignment": match.get("alignment")
+        }
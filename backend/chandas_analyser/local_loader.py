@@ -1,14 +1,19 @@
+import hashlib
 import json
 import logging
 import os
 import aiofiles  # Ensure you have this: pip install aiofiles
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
+
+from chandas_analyser.catalog import open_catalog
 
 logger = logging.getLogger(__name__)
 
 # Cache variable
-_cached_chandas: Optional[List[Dict[str, Any]]] = None
+_cached_chandas: Optional[Sequence[Dict[str, Any]]] = None
 _cached_mtime: Optional[float] = None
+# sha256 of the chandas_db.json the cache was built from; keys shared analysis caches
+_cached_version: str = "fallback"
 
 def _normalize_item(item: Any) -> Dict[str, Any]:
     """
@@ -26,23 +31,36 @@ def _normalize_item(item: Any) -> Dict[str, Any]:
     else:
         pattern = str(raw_pattern or "")
         
-    # Preserve other useful keys like pattern_regex or syllables_per_pada
+    # Preserve other useful keys like pattern_regex, syllables_per_pada or rules
     return {
         "name": name, 
         "pattern": pattern,
         "pattern_regex": item.get("pattern_regex", ""),
-        "syllables_per_pada": item.get("syllables_per_pada", 0)
+        "syllables_per_pada": item.get("syllables_per_pada", 0),
+        "rules": item.get("rules")
     }
 
-async def load_chandas_local() -> List[Dict[str, Any]]:
+async def load_chandas_local() -> Sequence[Dict[str, Any]]:
     """
     Read chandas_db.json from the SAME DIRECTORY as this script.
+    If a valid compiled snapshot (chandas_db.bin) is present it is memory-mapped instead.
     """
     # 1. CALCULATE ABSOLUTE PATH
     # Current file: backend/chandas_analyser/local_loader.py
     # Database file: backend/chandas_analyser/chandas_db.json
     current_dir = os.path.dirname(os.path.abspath(__file__))
     db_path = os.path.join(current_dir, "chandas_db.json")
+    compiled_path = os.path.join(current_dir, "chandas_db.bin")
+
+    global _cached_version
+    _cached_version = "fallback"
+
+    # 0. PREFER THE COMPILED SNAPSHOT (shared read-only mapping across workers)
+    compiled = open_catalog(compiled_path, db_path)
+    if compiled is not None:
+        _cached_version = compiled.source_sha256
+        logger.info(f"✅ Mapped compiled DB from {compiled_path} (Size: {len(compiled)} items)")
+        return compiled
 
     if not os.path.exists(db_path):
         logger.error(f"❌ DATABASE NOT FOUND at: {db_path}")
@@ -57,7 +75,8 @@ async def load_chandas_local() -> List[Dict[str, Any]]:
         async with aiofiles.open(db_path, mode='r', encoding='utf-8') as f:
             content = await f.read()
             raw = json.loads(content)
-            
+        _cached_version = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
         logger.info(f"✅ Loaded DB from {db_path} (Size: {len(raw)} items)")
         
         # 3. NORMALIZE
@@ -71,22 +90,37 @@ async def load_chandas_local() -> List[Dict[str, Any]]:
         return normalized
 
     except Exception as e:
+        _cached_version = "fallback"
         logger.exception(f"Failed to parse DB: {e}")
         # Return fallback on crash
         return [
             {"name": "Anuṣṭubh (Fallback)", "pattern": "L G L G L G L G"},
         ]
 
-async def get_chandas_cached(force_reload: bool = False) -> List[Dict[str, Any]]:
+async def get_chandas_cached(force_reload: bool = False) -> Sequence[Dict[str, Any]]:
     global _cached_chandas
     
-    # Reload if cache is empty, forced, or contains only the fallback
-    if force_reload or _cached_chandas is None or len(_cached_chandas) <= 2:
+    # Reload if cache is empty, forced, contains only the fallback, or is a compiled catalog that
+    # failed a record checksum (open_catalog then refuses it and the JSON is loaded instead)
+    if force_reload or _cached_chandas is None or len(_cached_chandas) <= 2 or getattr(_cached_chandas, "corrupt", False):
+        previous = _cached_chandas
         _cached_chandas = await load_chandas_local()
+        _close_catalog(previous)
         
     return _cached_chandas
 
+def _close_catalog(chandas: Optional[Sequence[Dict[str, Any]]]) -> None:
+    """Unmap a replaced compiled catalog (plain lists from the JSON need nothing)."""
+    close = getattr(chandas, "close", None)
+    if close is not None:
+        close()
+
+def get_chandas_version() -> str:
+    """Version tag of the currently cached DB (changes whenever chandas_db.json changes)."""
+    return _cached_version
+
 def clear_chandas_cache() -> None:
     global _cached_chandas
+    _close_catalog(_cached_chandas)
     _cached_chandas = None
     logger.info("Cleared chandas cache.")
\ No newline at end of file
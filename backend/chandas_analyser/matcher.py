@@ -1,17 +1,14 @@
 # app/matcher.py
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from math import ceil
 from chandas_analyser.config import SIMILARITY_THRESHOLD
+from chandas_analyser.rules import match_rules, get_compiled_rules
 
 logger = logging.getLogger("chandas_analyser.matcher")
 
-def levenshtein(a: str, b: str) -> int:
+def _levenshtein_matrix(a: str, b: str) -> List[List[int]]:
     m, n = len(a), len(b)
-    if m == 0:
-        return n
-    if n == 0:
-        return m
     dp = [[0] * (n + 1) for _ in range(m + 1)]
     for i in range(m + 1):
         dp[i][0] = i
@@ -22,7 +19,69 @@ def levenshtein(a: str, b: str) -> int:
         for j in range(1, n + 1):
             cost = 0 if a[i-1] == b[j-1] else 1
             dp[i][j] = min(dp[i-1][j] + 1, dp[i][j-1] + 1, dp[i-1][j-1] + cost)
-    return dp[m][n]
+    return dp
+
+
+def levenshtein(a: str, b: str) -> int:
+    m, n = len(a), len(b)
+    if m == 0:
+        return n
+    if n == 0:
+        return m
+    return _levenshtein_matrix(a, b)[m][n]
+
+
+def _edit_ops(dp: List[List[int]], a: str, b: str) -> List[Tuple[str, int, Optional[str], Optional[str]]]:
+    """
+    Trace a levenshtein matrix back into (op, position in a, expected, found) tuples turning a into b:
+    'sub' (a[pos] has the wrong weight), 'del' (a[pos] is extra), 'ins' (b needs a syllable before a[pos]).
+    """
+    ops = []
+    i, j = len(a), len(b)
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and a[i-1] == b[j-1] and dp[i][j] == dp[i-1][j-1]:
+            i -= 1; j -= 1; continue
+        if i > 0 and j > 0 and dp[i][j] == dp[i-1][j-1] + 1:
+            ops.append(("sub", i - 1, b[j-1], a[i-1])); i -= 1; j -= 1; continue
+        if i > 0 and dp[i][j] == dp[i-1][j] + 1:
+            ops.append(("del", i - 1, None, a[i-1])); i -= 1; continue
+        ops.append(("ins", i, b[j-1], None)); j -= 1
+    ops.reverse()
+    return ops
+
+
+def _build_alignment(input_padas: List[str], expected_padas: List[str], against: str) -> Dict[str, Any]:
+    """
+    Compact edit script of the input against the per-pada targets the best candidate was scored on.
+    'syllable' is the offset of the syllable in the whole verse (padas concatenated in order).
+    """
+    edits = []
+    distances = []
+    offset = 0
+    for i, inp in enumerate(input_padas):
+        exp = expected_padas[i] if i < len(expected_padas) else ""
+        dp = _levenshtein_matrix(inp, exp)
+        distances.append(dp[len(inp)][len(exp)])
+        for op, pos, expected, found in _edit_ops(dp, inp, exp):
+            edits.append({"op": op, "pada": i, "pos": pos, "syllable": offset + pos, "expected": expected, "found": found})
+        offset += len(inp)
+    return {"against": against, "expectedByPada": expected_padas, "distanceByPada": distances, "edits": edits}
+
+
+def _cached_levenshtein(a: str, b: str, cache: Optional[Dict[Tuple[str, str], int]]) -> int:
+    """
+    levenshtein() memoized in a caller-owned dict keyed by (input pada, aligned DB pada).
+    Long-lived callers (e.g. a live editing session) pass the same dict on every call so
+    only padas that actually changed are re-scored.
+    """
+    if cache is None:
+        return levenshtein(a, b)
+    key = (a, b)
+    dist = cache.get(key)
+    if dist is None:
+        dist = levenshtein(a, b)
+        cache[key] = dist
+    return dist
 
 
 def _normalize_pattern_to_padas(raw: Any) -> List[str]:
@@ -68,64 +127,91 @@ def _normalize_pattern_to_padas(raw: Any) -> List[str]:
     return normalized
 
 
-def _pad_or_truncate(pattern: str, length: int) -> str:
+def _whole_repeats(pattern: str, length: int) -> str:
     """
-    Repeat (concatenate) pattern until length reached, then truncate to 'length'.
-    If pattern is empty, return empty string of requested length (will produce distance = length).
+    Pattern repeated the nearest whole number of times (at least once) for an input pada of
+    'length' syllables: a line holding two padas is aligned against two, but a pada that is a
+    syllable short or long keeps its canonical length so the difference shows up as ins / del
+    (ties go to fewer repeats). An empty input pada gets an empty target.
     """
-    if not pattern:
-        return "".ljust(length)
-    rep = ceil(length / max(1, len(pattern)))
-    return (pattern * rep)[:length]
+    if not length:
+        return ""
+    size = max(1, len(pattern))
+    return pattern * max(1, (length + (size - 1) // 2) // size)
 
 
-def find_match_in_db(lg_patterns: List[str], db_chandas: List[Dict[str, Any]]) -> Dict[str, Any]:
+def find_match_in_db(lg_patterns: List[str], db_chandas: List[Dict[str, Any]],
+                     dist_cache: Optional[Dict[Tuple[str, str], int]] = None,
+                     with_alignment: bool = False) -> Dict[str, Any]:
     """
     Per-pada matching:
     - lg_patterns: list of strings (one per pada) extracted from input
     - db_chandas: list of dicts from DB; 'pattern' may be string, spaced, list, or '|' separated
+    - dist_cache: optional dict reused across calls to memoize per-pada distances
+    - with_alignment: also return 'alignment', the per-syllable edit script against the same per-pada
+      targets the score was computed on (see _build_alignment)
     Scoring:
-    - Compute per-pada similarity (1 - lev_dist / pada_len). If lengths mismatch, we align by truncating/repeating DB pada pattern.
+    - Compute per-pada similarity (1 - lev_dist / pada_len) against the DB pada repeated a whole number
+      of times (see _whole_repeats), so a missing or extra syllable costs one edit.
     - Final similarity is average of per-pada similarities (padas present in the input).
     - Bonus: prefer DB entries with same number of padas or with syllables_per_pada hint.
+    Rule-based meters (DB 'rules', see rules.py) are checked first and win outright when satisfied.
+    Otherwise akṣara rule meters are graded by the same compiled checks instead of their placeholder
+    'pattern': each pada's distance is the number of syllables its rules want changed, added or
+    removed (see CompiledRule.mismatches), and its targets have 'x' where any weight is allowed.
     """
     if not lg_patterns:
         return {"identifiedChandas": "Unknown", "similarity": 0.0, "matchedPattern": "", "explanation": "No vowels/syllables detected."}
 
     input_padas = [p.upper() for p in lg_patterns]
+
+    ruled = match_rules(lg_patterns, db_chandas)
+    if ruled is not None:
+        if with_alignment:
+            ruled["alignment"] = _build_alignment(input_padas, input_padas, ruled["identifiedChandas"])
+        return ruled
+
     num_padas = len(input_padas)
     input_lengths = [len(p) for p in input_padas]
 
     logger.debug("find_match_in_db: input_padas=%s lengths=%s", input_padas, input_lengths)
 
     best = {"name": "Unknown / Mixed", "similarity": 0.0, "matchedPattern": ""}
+    best_expected: Optional[List[str]] = None
+    best_alignment: Optional[Dict[str, Any]] = None
+    graded_rules = {rule.name: rule for rule in get_compiled_rules(db_chandas) if rule.syllables}
 
-    for ch in db_chandas:
-        raw = ch.get("pattern") or ch.get("patterns") or ch.get("lg") or ""
-        db_padas = _normalize_pattern_to_padas(raw)
+    # A compiled catalog (see catalog.py) already stores each entry's padas in packed form
+    packed_padas = getattr(db_chandas, "pada_patterns", None)
 
+    for idx, ch in enumerate(db_chandas):
+        if packed_padas is not None:
+            db_padas = packed_padas(idx)
+        else:
+            raw = ch.get("pattern") or ch.get("patterns") or ch.get("lg") or ""
+            db_padas = _normalize_pattern_to_padas(raw)
+
+        rule = graded_rules.get(ch.get("name", "Unknown"))
+        rule_alignment = rule.mismatches(input_padas) if rule is not None else None
         # If DB has one compact pattern but input has multiple padas, we'll split/truncate later by repeating base
-        if len(db_padas) == 0:
+        if len(db_padas) == 0 and rule_alignment is None:
             continue
 
-        # Build per-pada db strings aligned to input padas
-        per_pada_db = []
-        if len(db_padas) == num_padas:
+        # DB padas for each input pada, repeated for input lines that hold several of them
+        if rule_alignment is not None:
+            # graded by its rules; 'x' marks positions any weight satisfies
+            seq = rule_alignment["expectedByPada"]
+        elif len(db_padas) == num_padas:
             # same count — align 1:1
-            for i in range(num_padas):
-                per_pada_db.append(_pad_or_truncate(db_padas[i], input_lengths[i]))
-        elif len(db_padas) > 1 and len(db_padas) != num_padas:
-            # DB has multiple padas but count mismtach — try to align by repeating or truncating DB padas sequence
-            # repeat the sequence to match num_padas
+            seq = db_padas
+        elif len(db_padas) > 1:
+            # DB has multiple padas but count mismtach — repeat or truncate the DB padas sequence
             rep = ceil(num_padas / len(db_padas))
             seq = (db_padas * rep)[:num_padas]
-            for i, dp in enumerate(seq):
-                per_pada_db.append(_pad_or_truncate(dp, input_lengths[i]))
         else:
-            # db_padas has single base pattern (or fewer) — repeat/truncate to each input pada length
-            base = db_padas[0]
-            for i in range(num_padas):
-                per_pada_db.append(_pad_or_truncate(base, input_lengths[i]))
+            # db_padas has single base pattern — repeat it for every input pada
+            seq = [db_padas[0]] * num_padas
+        per_pada_db = seq if rule_alignment is not None else [_whole_repeats(dp, input_lengths[i]) for i, dp in enumerate(seq)]
 
         # compute per-pada similarities
         total_sim = 0.0
@@ -135,29 +221,31 @@ def find_match_in_db(lg_patterns: List[str], db_chandas: List[Dict[str, Any]]) -
             dbp = per_pada_db[i] if i < len(per_pada_db) else ""
             # if both empty -> perfect match
             if len(inp) == 0 and len(dbp) == 0:
+                dist = 0
                 sim = 1.0
             else:
-                dist = levenshtein(inp, dbp)
+                dist = rule_alignment["distanceByPada"][i] if rule_alignment is not None else _cached_levenshtein(inp, dbp, dist_cache)
                 sim = 1.0 - (dist / max(1, len(inp)))
                 if sim < 0:
                     sim = 0.0
             total_sim += sim
             valid_counts += 1
 
-            logger.debug("DB '%s' pada %d: inp=%s db=%s dist=%d sim=%.3f", ch.get("name","<unnamed>"), i, inp, dbp, levenshtein(inp, dbp), sim)
+            logger.debug("DB '%s' pada %d: inp=%s db=%s dist=%d sim=%.3f", ch.get("name","<unnamed>"), i, inp, dbp, dist, sim)
 
         avg_sim = (total_sim / valid_counts) if valid_counts else 0.0
 
-        # small bonus/penalty heuristics
+        # small bonus/penalty heuristics (not for rule meters: their edits already count pada lengths,
+        # and a verse that fails its rules must stay below the 1.0 of one that satisfies them)
         bonus = 0.0
         # if DB stored 'syllables_per_pada' and matches input pada length, add tiny bonus
-        sp_p = ch.get("syllables_per_pada")
+        sp_p = ch.get("syllables_per_pada") if rule_alignment is None else None
         if sp_p and isinstance(sp_p, int):
             if all(sp_p == L for L in input_lengths):
                 bonus += 0.08  # prefer exact syllable-per-pada matches
 
         # if DB has same number of padas, small bonus
-        if len(_normalize_pattern_to_padas(raw)) == num_padas:
+        if rule_alignment is None and len(db_padas) == num_padas:
             bonus += 0.03
 
         final_score = max(0.0, min(1.0, avg_sim + bonus))
@@ -165,15 +253,17 @@ def find_match_in_db(lg_patterns: List[str], db_chandas: List[Dict[str, Any]]) -
         logger.debug("Candidate '%s' avg_sim=%.4f bonus=%.3f final=%.4f", ch.get("name","<unnamed>"), avg_sim, bonus, final_score)
 
         if final_score > best["similarity"]:
-            best = {"name": ch.get("name", "Unknown"), "similarity": final_score, "matchedPattern": "|".join(_normalize_pattern_to_padas(raw))}
-
-    # Apply Anuṣṭubh exact heuristic as high confidence override (preserve existing behavior)
-    combined = "".join(input_padas)
-    if len(combined) % 8 == 0 and len(combined) >= 8:
-        padas = [combined[i:i+8] for i in range(0, len(combined), 8)]
-        if all(len(p) == 8 and p[4] == "L" and p[5] == "G" for p in padas):
-            return {"identifiedChandas": "Anuṣṭubh", "similarity": 1.0, "matchedPattern": "LGLLGGLG", "explanation": f"Matches Anuṣṭubh heuristic (pādas: {len(padas)}). Full pattern: '{combined}'."}
+            best = {"name": ch.get("name", "Unknown"), "similarity": final_score, "matchedPattern": "|".join(seq if rule_alignment is not None else db_padas)}
+            best_expected, best_alignment = per_pada_db, rule_alignment
 
     identified = best["name"] if best["similarity"] >= float(SIMILARITY_THRESHOLD) else "Unknown / Mixed"
     explanation = f"Detected average per-pada similarity {best['similarity']*100:.1f}% vs DB canonical '{best['matchedPattern']}'"
-    return {"identifiedChandas": identified, "similarity": round(best["similarity"], 4), "matchedPattern": best["matchedPattern"], "explanation": explanation}
\ No newline at end of file
+    if best_alignment is not None:
+        explanation += f" ({best['name']} rules; x = either weight)"
+    result = {"identifiedChandas": identified, "similarity": round(best["similarity"], 4), "matchedPattern": best["matchedPattern"], "explanation": explanation}
+    if with_alignment:
+        alignment = best_alignment
+        if alignment is None and best_expected is not None:
+            alignment = _build_alignment(input_padas, best_expected, best["name"])
+        result["alignment"] = alignment
+    return result
\ No newline at end of file
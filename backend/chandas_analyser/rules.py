@@ -0,0 +1,361 @@
+# app/rules.py
+"""
+Declarative rule-based meters (jāti / vipulā aware).
+
+A DB entry may carry a "rules" object; it is compiled once per loaded DB into bitmask checks so
+matching a meter costs O(padas) with no per-meter Python branching at request time.
+
+    "rules": {
+      "syllables_per_pada": 8,          # akṣara meters: re-chunk the verse into N-syllable padas
+      "matras": [12, 18, 12, 15],       # mātrā meters: pada totals (L = 1, G = 2), cycled
+      "padas": 4,                       # optional: required pada count (default: any full cycle)
+      "all":  {"5": "L"},               # per-position requirements (1-based) for every pada
+      "odd":  [{"name": "pathyā", "positions": {"5": "L", "6": "G", "7": "G"}}, ...],
+      "even": {"5": "L", "6": "G", "7": "L"},
+      "ganas": {                        # mātrā meters: gaṇa layout of each pada (cycled)
+        "size": 4,                      #   "g" = one gaṇa of this many mātrās, "L" / "G" = one syllable
+        "group": 2,                     #   items are numbered from 1 across this many padas (a half-verse)
+        "padas": [["g", "g", "g"], ["g", "g", "g", "g", "G"], ...],
+        "forbid": {"odd": ["LGL"]},     #   by item number ("odd" / "even" / "all" / "6"): forms not allowed
+        "allow":  {"6": ["LGL", "LLLL"]}  #   ... or the only forms allowed
+      }
+    }
+
+"all" / "odd" / "even" take either one positions dict or a list of named alternatives
+(e.g. the vipulā variants); a pada passes a group if any alternative matches.
+
+The re-chunked padas must keep the input's own pada breaks: every input break has to fall on a
+rule pada boundary (an input line may hold several rule padas, never part of one). Mātrā rules
+need "ganas" or position requirements; a bare mātrā total is too weak to win outright.
+"""
+import logging
+from bisect import bisect_left
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+logger = logging.getLogger("chandas_analyser.rules")
+
+MATRA = {"L": 1, "G": 2}
+
+# (mask, value, min_len, name): pada passes if (bits & mask) == value and len(pada) >= min_len
+_Alt = Tuple[int, int, int, str]
+
+
+def _compile_positions(positions: Dict[str, Any]) -> Tuple[int, int, int]:
+    mask = value = min_len = 0
+    for pos, weight in positions.items():
+        i = int(pos) - 1
+        if i < 0:
+            raise ValueError(f"rule positions are 1-based, got {pos!r}")
+        w = str(weight).upper()
+        if w not in ("L", "G"):
+            raise ValueError(f"rule weight must be 'L' or 'G', got {weight!r}")
+        mask |= 1 << i
+        if w == "G":
+            value |= 1 << i
+        min_len = max(min_len, i + 1)
+    return mask, value, min_len
+
+
+def _compile_group(group: Any) -> List[_Alt]:
+    if not group:
+        return []
+    alternatives = group if isinstance(group, list) else [group]
+    compiled: List[_Alt] = []
+    for alt in alternatives:
+        if "positions" in alt:
+            name, positions = str(alt.get("name") or ""), alt["positions"]
+        else:
+            name, positions = "", alt
+        compiled.append(_compile_positions(positions) + (name,))
+    return compiled
+
+
+def _pada_bits(pada: str) -> int:
+    bits = 0
+    for i, ch in enumerate(pada):
+        if ch == "G":
+            bits |= 1 << i
+    return bits
+
+
+class _InputView:
+    """Per-request view of the input shared by all rule-based meters (bits, prefix sums)."""
+
+    def __init__(self, lg_patterns: Sequence[str]):
+        self.combined = "".join(p.upper() for p in lg_patterns)
+        # syllable offsets where the input itself breaks padas
+        self.breaks = set()
+        offset = 0
+        for p in lg_patterns[:-1]:
+            offset += len(p)
+            self.breaks.add(offset)
+        self._chunks: Dict[int, Optional[List[str]]] = {}
+        self._prefix: Optional[List[int]] = None
+
+    def chunked(self, size: int) -> Optional[List[str]]:
+        """Combined pattern split into 'size'-syllable padas, or None if it does not divide evenly."""
+        if size not in self._chunks:
+            n = len(self.combined)
+            ok = n >= size and n % size == 0
+            self._chunks[size] = [self.combined[i:i + size] for i in range(0, n, size)] if ok else None
+        return self._chunks[size]
+
+    @property
+    def prefix(self) -> List[int]:
+        """prefix[i] = mātrās of the first i syllables."""
+        if self._prefix is None:
+            acc = [0]
+            for ch in self.combined:
+                acc.append(acc[-1] + MATRA.get(ch, 0))
+            self._prefix = acc
+        return self._prefix
+
+    def by_matras(self, targets: Sequence[int]) -> Optional[List[str]]:
+        """Split at cumulative mātrā boundaries (targets cycled); None if a boundary falls mid-syllable."""
+        prefix = self.prefix
+        total = prefix[-1]
+        cycle = sum(targets)
+        if not cycle or total == 0 or total % cycle:
+            return None
+        padas = []
+        start, boundary, k = 0, 0, 0
+        while boundary < total:
+            boundary += targets[k % len(targets)]
+            k += 1
+            # prefix sums are strictly increasing, so each boundary is one bisect
+            end = bisect_left(prefix, boundary, start)
+            if end >= len(prefix) or prefix[end] != boundary:
+                return None
+            padas.append(self.combined[start:end])
+            start = end
+        return padas
+
+    def keeps_breaks(self, padas: Sequence[str]) -> bool:
+        """True if every input pada break is also a break between 'padas'."""
+        boundaries, offset = set(), 0
+        for p in padas:
+            offset += len(p)
+            boundaries.add(offset)
+        return self.breaks <= boundaries
+
+
+def _item_selector(key: str):
+    if key == "all":
+        return lambda n: True
+    if key == "odd":
+        return lambda n: n % 2 == 1
+    if key == "even":
+        return lambda n: n % 2 == 0
+    number = int(key)
+    return lambda n: n == number
+
+
+class _GanaLayout:
+    """Gaṇa decomposition check for mātrā meters (the "ganas" rule)."""
+
+    def __init__(self, spec: Dict[str, Any], matras: Sequence[int]):
+        self.size = int(spec["size"])
+        self.group = int(spec.get("group") or 1)
+        self.padas = [[str(item) for item in layout] for layout in spec["padas"]]
+        if self.size <= 0 or self.group <= 0 or not self.padas:
+            raise ValueError("ganas need a positive 'size', 'group' and at least one pada layout")
+        for i, layout in enumerate(self.padas):
+            if any(item not in ("g", "L", "G") for item in layout):
+                raise ValueError(f"gana items must be 'g', 'L' or 'G', got {layout!r}")
+            total = sum(self.size if item == "g" else MATRA[item] for item in layout)
+            if matras and total != matras[i % len(matras)]:
+                raise ValueError(f"gana layout {i + 1} adds up to {total} mātrās, expected {matras[i % len(matras)]}")
+        self.checks = []   # (selector, forms, allowed)
+        for key, forms in (spec.get("forbid") or {}).items():
+            self.checks.append((_item_selector(key), frozenset(f.upper() for f in forms), False))
+        for key, forms in (spec.get("allow") or {}).items():
+            self.checks.append((_item_selector(key), frozenset(f.upper() for f in forms), True))
+
+    def _form_ok(self, number: int, form: str) -> bool:
+        for selects, forms, allowed in self.checks:
+            if selects(number) and (form in forms) != allowed:
+                return False
+        return True
+
+    def check(self, padas: Sequence[str]) -> bool:
+        number = 0
+        for idx, pada in enumerate(padas):
+            if idx % self.group == 0:
+                number = 0
+            pos = 0
+            for item in self.padas[idx % len(self.padas)]:
+                number += 1
+                if item != "g":
+                    if pos >= len(pada) or pada[pos] != item:
+                        return False
+                    pos += 1
+                    continue
+                start, total = pos, 0
+                while total < self.size and pos < len(pada):
+                    total += MATRA.get(pada[pos], 0)
+                    pos += 1
+                if total != self.size or not self._form_ok(number, pada[start:pos]):
+                    return False
+            if pos != len(pada):
+                return False
+        return True
+
+
+class CompiledRule:
+    def __init__(self, name: str, rules: Dict[str, Any]):
+        self.name = name
+        self.syllables = int(rules.get("syllables_per_pada") or 0)
+        self.matras = tuple(int(m) for m in rules.get("matras") or ())
+        self.padas = int(rules.get("padas") or 0)
+        if not self.syllables and not self.matras:
+            raise ValueError("rules need 'syllables_per_pada' or 'matras'")
+        self.all = _compile_group(rules.get("all"))
+        self.odd = _compile_group(rules.get("odd"))
+        self.even = _compile_group(rules.get("even"))
+        self.ganas = _GanaLayout(rules["ganas"], self.matras) if rules.get("ganas") else None
+        if self.matras and not (self.ganas or self.all or self.odd or self.even):
+            raise ValueError("mātrā rules need 'ganas' or position requirements")
+
+    def _segment(self, view: _InputView) -> Optional[List[str]]:
+        if self.matras:
+            return view.by_matras(self.matras)
+        return view.chunked(self.syllables)
+
+    @staticmethod
+    def _first_passing(alts: List[_Alt], bits: int, length: int) -> Optional[str]:
+        if not alts:
+            return ""
+        for mask, value, min_len, alt_name in alts:
+            if length >= min_len and bits & mask == value:
+                return alt_name
+        return None
+
+    def check(self, view: _InputView) -> Optional[Dict[str, Any]]:
+        padas = self._segment(view)
+        if not padas:
+            return None
+        if self.padas and len(padas) != self.padas:
+            return None
+        if not view.keeps_breaks(padas):
+            return None
+        if self.ganas is not None and not self.ganas.check(padas):
+            return None
+
+        variants = []
+        for idx, pada in enumerate(padas):
+            bits, length = _pada_bits(pada), len(pada)
+            if self._first_passing(self.all, bits, length) is None:
+                return None
+            parity = self.odd if idx % 2 == 0 else self.even   # pada 1 is odd
+            variant = self._first_passing(parity, bits, length)
+            if variant is None:
+                return None
+            variants.append(variant)
+        return {"padas": padas, "variants": variants}
+
+    @staticmethod
+    def _closest(alts: List[_Alt], bits: int, length: int) -> Dict[int, str]:
+        """Positions (0-based) -> weight required by the alternative with the fewest violations."""
+        best = None
+        present = (1 << length) - 1
+        for mask, value, _, _ in alts:
+            wrong = bin((bits ^ value) & mask & present).count("1")
+            if best is None or wrong < best[0]:
+                best = (wrong, mask, value)
+        if best is None:
+            return {}
+        _, mask, value = best
+        return {i: "G" if value >> i & 1 else "L" for i in range(mask.bit_length()) if mask >> i & 1}
+
+    def mismatches(self, lg_patterns: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        Edit script of an input that fails an akṣara rule, in matcher._build_alignment's shape.
+        Each input pada is read as the nearest whole number of rule padas: surplus syllables are
+        'del', missing ones 'ins' at the pada end, and positions where the closest alternative wants
+        the other weight 'sub'. expectedByPada has 'x' where the rule leaves the weight free.
+        None for mātrā rules (their pada boundaries move with the weights).
+        """
+        if not self.syllables:
+            return None
+        size = self.syllables
+        edits, expected_by_pada, distances = [], [], []
+        offset = number = 0
+        for i, raw in enumerate(lg_patterns):
+            pada = raw.upper()
+            count = max(1, (len(pada) + (size - 1) // 2) // size)   # ties read as fewer padas
+            expected, pada_edits = [], []
+            for c in range(count):
+                chunk = pada[c * size:(c + 1) * size]
+                bits = _pada_bits(chunk)
+                need = self._closest(self.all, bits, len(chunk))
+                need.update(self._closest(self.odd if number % 2 == 0 else self.even, bits, len(chunk)))
+                number += 1
+                for j in range(size):
+                    want = need.get(j)
+                    expected.append(want or "x")
+                    if j >= len(chunk):
+                        pada_edits.append(("ins", len(pada), want, None))
+                    elif want and chunk[j] != want:
+                        pada_edits.append(("sub", c * size + j, want, chunk[j]))
+            for pos in range(count * size, len(pada)):
+                pada_edits.append(("del", pos, None, pada[pos]))
+            for op, pos, want, found in pada_edits:
+                edits.append({"op": op, "pada": i, "pos": pos, "syllable": offset + pos, "expected": want, "found": found})
+            expected_by_pada.append("".join(expected))
+            distances.append(len(pada_edits))
+            offset += len(pada)
+        return {"against": self.name, "expectedByPada": expected_by_pada, "distanceByPada": distances, "edits": edits}
+
+
+def compile_db_rules(db_chandas: Sequence[Dict[str, Any]]) -> List[CompiledRule]:
+    compiled = []
+    for ch in db_chandas:
+        rules = ch.get("rules")
+        if not rules:
+            continue
+        try:
+            compiled.append(CompiledRule(ch.get("name", "Unknown"), rules))
+        except (ValueError, TypeError, AttributeError, KeyError) as e:
+            logger.warning("Ignoring invalid rules for '%s': %s", ch.get("name", "<unnamed>"), e)
+    return compiled
+
+
+# Rules compiled for the last DB object seen (the DB only changes on /reload-db)
+_compiled_db: Optional[Sequence[Dict[str, Any]]] = None
+_compiled_rules: List[CompiledRule] = []
+
+
+def get_compiled_rules(db_chandas: Sequence[Dict[str, Any]]) -> List[CompiledRule]:
+    global _compiled_db, _compiled_rules
+    if db_chandas is not _compiled_db:
+        _compiled_rules = compile_db_rules(db_chandas)
+        _compiled_db = db_chandas
+    return _compiled_rules
+
+
+def match_rules(lg_patterns: Sequence[str], db_chandas: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Return a high-confidence match for the first rule-based meter (DB order) the input satisfies,
+    or None.
+    """
+    rules = get_compiled_rules(db_chandas)
+    if not rules:
+        return None
+    view = _InputView(lg_patterns)
+    if not view.combined:
+        return None
+
+    for rule in rules:
+        res = rule.check(view)
+        if res is None:
+            continue
+        padas = res["padas"]
+        named = [f"{i + 1}:{v}" for i, v in enumerate(res["variants"]) if v]
+        variant_note = f"; variants {', '.join(named)}" if named else ""
+        return {
+            "identifiedChandas": rule.name,
+            "similarity": 1.0,
+            "matchedPattern": "|".join(padas),
+            "explanation": f"Satisfies {rule.name} rules (pādas: {len(padas)}{variant_note}). Full pattern: '{view.combined}'."
+        }
+    return None
@@ -0,0 +1,183 @@
+# app/shared_cache.py
+"""
+Optional host-wide result cache shared by all uvicorn workers.
+
+Backed by a local SQLite file in WAL mode, so every worker on the host reads the same entries
+and a freshly (re)started worker is warm from its first request. Entries are keyed by
+(namespace, sha256 of the input, version), where the version combines RESULT_VERSION, the
+similarity threshold and the DB version, and are evicted least-recently-used once the table
+grows past max_entries. A hit is a single SELECT: last-access times and hit/miss counters are
+buffered per worker and written in one transaction every _FLUSH_EVERY reads or
+_FLUSH_SECONDS. Disabled unless SHARED_CACHE_PATH is set.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from chandas_analyser.config import SHARED_CACHE_PATH, SHARED_CACHE_MAX_ENTRIES, SIMILARITY_THRESHOLD
+from chandas_analyser.sqlite_store import open_wal_db
+
+logger = logging.getLogger("chandas_analyser.shared_cache")
+
+# Bump whenever analysis output or matching behaviour changes, so older entries stop being served
+RESULT_VERSION = 5
+
+# Evict at most every N writes; keeps the common write path to a single INSERT
+_EVICT_EVERY = 64
+# Buffered read bookkeeping (last_access, hit/miss counts) is flushed after this many reads or seconds
+_FLUSH_EVERY = 256
+_FLUSH_SECONDS = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace   TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    db_version  TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (namespace, key, db_version)
+);
+CREATE INDEX IF NOT EXISTS cache_last_access ON cache (last_access);
+CREATE TABLE IF NOT EXISTS cache_stats (
+    namespace TEXT PRIMARY KEY,
+    hits      INTEGER NOT NULL DEFAULT 0,
+    misses    INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def input_hash(value: Any) -> str:
+    """Stable sha256 key for a string or any JSON-serializable request spec."""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+class SharedAnalysisCache:
+    def __init__(self, path: str, max_entries: int = SHARED_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._touched: Dict[Tuple[str, str, str], float] = {}
+        self._counts: Dict[str, List[int]] = {}   # namespace -> [hits, misses]
+        self._pending_reads = 0
+        self._last_flush = time.monotonic()
+        # One connection per worker process, used from asyncio.to_thread() threads under the lock
+        self._conn = open_wal_db(path, _SCHEMA, timeout=5.0)
+
+    @staticmethod
+    def _version(db_version: str) -> str:
+        return f"{RESULT_VERSION}:{SIMILARITY_THRESHOLD}:{db_version}"
+
+    def _record_read(self, namespace: str, row_key: Optional[Tuple[str, str, str]]) -> None:
+        counts = self._counts.setdefault(namespace, [0, 0])
+        if row_key is None:
+            counts[1] += 1
+        else:
+            counts[0] += 1
+            self._touched[row_key] = time.time()
+        self._pending_reads += 1
+        if self._pending_reads >= _FLUSH_EVERY or time.monotonic() - self._last_flush >= _FLUSH_SECONDS:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write buffered last_access times and counters in one transaction (caller holds the lock)."""
+        touched, counts = self._touched, self._counts
+        self._touched, self._counts = {}, {}
+        self._pending_reads = 0
+        self._last_flush = time.monotonic()
+        if not touched and not counts:
+            return
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "UPDATE cache SET last_access = MAX(last_access, ?) WHERE namespace = ? AND key = ? AND db_version = ?",
+                [(ts, ns, key, ver) for (ns, key, ver), ts in touched.items()])
+            self._conn.executemany(
+                "INSERT INTO cache_stats (namespace, hits, misses) VALUES (?, ?, ?) "
+                "ON CONFLICT(namespace) DO UPDATE SET hits = hits + excluded.hits, misses = misses + excluded.misses",
+                [(ns, hits, misses) for ns, (hits, misses) in counts.items()])
+            self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            # Bookkeeping only: losing one batch of access times / counters is acceptable
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            logger.warning("Shared cache bookkeeping flush failed: %s", e)
+
+    def get(self, namespace: str, key_input: Any, db_version: str) -> Optional[Any]:
+        key, version = input_hash(key_input), self._version(db_version)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE namespace = ? AND key = ? AND db_version = ?",
+                (namespace, key, version)).fetchone()
+            self._record_read(namespace, None if row is None else (namespace, key, version))
+        return None if row is None else json.loads(row[0])
+
+    def set(self, namespace: str, key_input: Any, db_version: str, value: Any) -> None:
+        key, version = input_hash(key_input), self._version(db_version)
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, db_version, value, last_access) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, version, payload, time.time()))
+            self._writes += 1
+            if self._writes % _EVICT_EVERY == 0:
+                self._evict()
+
+    def _evict(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache ORDER BY last_access LIMIT ?)",
+                (excess,))
+            logger.info("Shared cache evicted %d entries (limit %d)", excess, self.max_entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._flush()
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+            rows = self._conn.execute("SELECT namespace, hits, misses FROM cache_stats").fetchall()
+        by_ns = {}
+        for ns, hits, misses in rows:
+            total = hits + misses
+            by_ns[ns] = {"hits": hits, "misses": misses, "hitRate": round(hits / total, 4) if total else 0.0}
+        return {"path": self.path, "entries": entries, "maxEntries": self.max_entries, "namespaces": by_ns}
+
+    # Async wrappers: SQLite calls are short but blocking, keep them off the event loop
+    async def aget(self, namespace: str, key_input: Any, db_version: str) -> Optional[Any]:
+        try:
+            return await asyncio.to_thread(self.get, namespace, key_input, db_version)
+        except sqlite3.Error as e:
+            logger.warning("Shared cache read failed: %s", e)
+            return None
+
+    async def aset(self, namespace: str, key_input: Any, db_version: str, value: Any) -> None:
+        try:
+            await asyncio.to_thread(self.set, namespace, key_input, db_version, value)
+        except sqlite3.Error as e:
+            logger.warning("Shared cache write failed: %s", e)
+
+
+_shared_cache: Optional[SharedAnalysisCache] = None
+_shared_cache_init = False
+
+
+def get_shared_cache() -> Optional[SharedAnalysisCache]:
+    """Process-wide cache instance, or None when SHARED_CACHE_PATH is unset or unusable."""
+    global _shared_cache, _shared_cache_init
+    if not _shared_cache_init:
+        _shared_cache_init = True
+        if SHARED_CACHE_PATH:
+            try:
+                _shared_cache = SharedAnalysisCache(SHARED_CACHE_PATH)
+                logger.info("Shared analysis cache enabled at %s", SHARED_CACHE_PATH)
+            except sqlite3.Error as e:
+                logger.warning("Could not open shared cache at %s: %s", SHARED_CACHE_PATH, e)
+    return _shared_cache
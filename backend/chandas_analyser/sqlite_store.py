@@ -0,0 +1,15 @@
+# app/sqlite_store.py
+import sqlite3
+
+
+def open_wal_db(path: str, schema: str, timeout: float = 30.0) -> sqlite3.Connection:
+    """
+    Open a SQLite file shared by every worker process: WAL journal (readers never block the
+    writer), synchronous=NORMAL, autocommit (callers issue BEGIN themselves) and usable from
+    asyncio.to_thread() threads; callers serialize use with their own lock. Runs 'schema' once.
+    """
+    conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(schema)
+    return conn
@@ -2,8 +2,8 @@
 import re
 import logging
 from typing import List
-from indic_transliteration import sanscript
-from indic_transliteration.sanscript import transliterate
+
+from chandas_analyser.transliteration import devanagari_to_iast, iast_to_devanagari
 
 logger = logging.getLogger("chandas_analyser.syllabifier")
 
@@ -18,7 +18,7 @@ _non_vowel_chars_re = re.compile(r"[^a-zāīūṛṝḷṃṁḥ]")
 def to_iast(text: str) -> str:
     if re.search(r"[\u0900-\u097F]", text):
         try:
-            return transliterate(text, sanscript.DEVANAGARI, sanscript.IAST).lower()
+            return devanagari_to_iast(text).lower()
         except Exception as e:
             logger.exception("Transliteration error to IAST: %s", e)
             return text.lower()
@@ -28,42 +28,46 @@ def to_devanagari(text: str) -> str:
     if re.search(r"[\u0900-\u097F]", text):
         return text
     try:
-        return transliterate(text, sanscript.IAST, sanscript.DEVANAGARI)
+        return iast_to_devanagari(text)
     except Exception:
         return text
 
-def get_lg_pattern(shloka: str) -> List[str]:
-    padas = [p.strip() for p in re.split(r"[|।॥\n]+", shloka) if p.strip()]
-    patterns: List[str] = []
+_pada_split_re = re.compile(r"[|।॥\n]+")
+
+def split_padas(shloka: str) -> List[str]:
+    return [p.strip() for p in _pada_split_re.split(shloka) if p.strip()]
 
-    for pada in padas:
-        iast = to_iast(pada)
-        iast = re.sub(r"[.\d\s]+", "", iast)
-        iast = _non_vowel_chars_re.sub("", iast)
+def pada_lg_pattern(pada: str) -> str:
+    iast = to_iast(pada)
+    iast = re.sub(r"[.\d\s]+", "", iast)
+    iast = _non_vowel_chars_re.sub("", iast)
 
-        pattern = ""
-        i = 0
-        while i < len(iast):
-            two = iast[i:i+2]
-            ch = iast[i] if i < len(iast) else ""
+    pattern = ""
+    i = 0
+    while i < len(iast):
+        two = iast[i:i+2]
+        ch = iast[i] if i < len(iast) else ""
 
-            if two in DIPHTHONGS:
-                pattern += "G"; i += 2; continue
-            if ch in LONG_VOWELS:
+        if two in DIPHTHONGS:
+            pattern += "G"; i += 2; continue
+        if ch in LONG_VOWELS:
+            pattern += "G"; i += 1; continue
+        if ch in SIMPLE_VOWELS:
+            nxt = iast[i+1] if i+1 < len(iast) else ""
+            nxt2 = iast[i+2] if i+2 < len(iast) else ""
+            if nxt in SPECIALS:
                 pattern += "G"; i += 1; continue
-            if ch in SIMPLE_VOWELS:
-                nxt = iast[i+1] if i+1 < len(iast) else ""
-                nxt2 = iast[i+2] if i+2 < len(iast) else ""
-                if nxt in SPECIALS:
-                    pattern += "G"; i += 1; continue
-                cond1 = nxt and (nxt not in ALL_VOWELS)
-                cond2 = nxt2 and (nxt2 not in ALL_VOWELS)
-                if cond1 and cond2:
-                    pattern += "G"; i += 1; continue
-                pattern += "L"; i += 1; continue
-            i += 1
+            cond1 = nxt and (nxt not in ALL_VOWELS)
+            cond2 = nxt2 and (nxt2 not in ALL_VOWELS)
+            if cond1 and cond2:
+                pattern += "G"; i += 1; continue
+            pattern += "L"; i += 1; continue
+        i += 1
+
+    return pattern
 
-        patterns.append(pattern)
+def get_lg_pattern(shloka: str) -> List[str]:
+    patterns: List[str] = [pada_lg_pattern(pada) for pada in split_padas(shloka)]
 
     logger.debug("get_lg_pattern input='%s' -> %s", shloka, patterns)
     return patterns
@@ -0,0 +1,372 @@
+# app/translit_tables.py
+# Generated by `python -m chandas_analyser.transliteration` from indic-transliteration 2.3.82. Do not edit.
+# fmt: off
+LIBRARY_VERSION = '2.3.82'
+DEVA_IAST_TOKENS = {
+    'ँ': (True, '~', False),
+    'ं': (True, 'ṃ', False),
+    'ः': (True, 'ḥ', False),
+    'अ': (True, 'a', False),
+    'आ': (True, 'ā', False),
+    'इ': (True, 'i', False),
+    'ई': (True, 'ī', False),
+    'उ': (True, 'u', False),
+    'ऊ': (True, 'ū', False),
+    'ऋ': (True, 'ṛ', False),
+    'ऌ': (True, 'ḷ', False),
+    'ऎ': (True, 'è', False),
+    'ए': (True, 'e', False),
+    'ऐ': (True, 'ai', False),
+    'ऒ': (True, 'ò', False),
+    'ओ': (True, 'o', False),
+    'औ': (True, 'au', False),
+    'क': (True, 'k', True),
+    'क़': (True, 'q', True),
+    'क्ष': (True, 'kṣ', True),
+    'ख': (True, 'kh', True),
+    'ख़': (True, 'k͟h', True),
+    'ग': (True, 'g', True),
+    'ग़': (True, 'ġ', True),
+    'घ': (True, 'gh', True),
+    'ङ': (True, 'ṅ', True),
+    'च': (True, 'c', True),
+    'छ': (True, 'ch', True),
+    'ज': (True, 'j', True),
+    'ज़': (True, 'z', True),
+    'ज्ञ': (True, 'jñ', True),
+    'झ': (True, 'jh', True),
+    'ञ': (True, 'ñ', True),
+    'ट': (True, 'ṭ', True),
+    'ठ': (True, 'ṭh', True),
+    'ड': (True, 'ḍ', True),
+    'ड़': (True, 'r̤', True),
+    'ढ': (True, 'ḍh', True),
+    'ढ़': (True, 'r̤h', True),
+    'ण': (True, 'ṇ', True),
+    'त': (True, 't', True),
+    'थ': (True, 'th', True),
+    'द': (True, 'd', True),
+    'ध': (True, 'dh', True),
+    'न': (True, 'n', True),
+    'ऩ': (True, 'ṉ', True),
+    'ऩ': (True, 'ṉ', True),
+    'प': (True, 'p', True),
+    'फ': (True, 'ph', True),
+    'फ़': (True, 'f', True),
+    'ब': (True, 'b', True),
+    'भ': (True, 'bh', True),
+    'म': (True, 'm', True),
+    'य': (True, 'y', True),
+    'य़': (True, 'ẏ', True),
+    'र': (True, 'r', True),
+    'ऱ': (True, 'ṟ', True),
+    'ऱ': (True, 'ṟ', True),
+    'ल': (True, 'l', True),
+    'ळ': (True, 'ḻ', True),
+    'ऴ': (True, 'l̤', True),
+    'ऴ': (True, 'l̤', True),
+    'व': (True, 'v', True),
+    'श': (True, 'ś', True),
+    'ष': (True, 'ṣ', True),
+    'स': (True, 's', True),
+    'ह': (True, 'h', True),
+    'ऽ': (True, "'", False),
+    'ा': (False, 'ā', False),
+    'ि': (False, 'i', False),
+    'ी': (False, 'ī', False),
+    'ु': (False, 'u', False),
+    'ू': (False, 'ū', False),
+    'ृ': (False, 'ṛ', False),
+    'ॄ': (False, 'ṝ', False),
+    'ॆ': (False, 'è', False),
+    'े': (False, 'e', False),
+    'ै': (False, 'ai', False),
+    'ॊ': (False, 'ò', False),
+    'ो': (False, 'o', False),
+    'ौ': (False, 'au', False),
+    '्': (False, '', False),
+    'ॐ': (True, 'oṃ', False),
+    '॑': (True, '̭', False),
+    '॒': (True, '̱', False),
+    'क़': (True, 'q', True),
+    'ख़': (True, 'k͟h', True),
+    'ग़': (True, 'ġ', True),
+    'ज़': (True, 'z', True),
+    'ड़': (True, 'r̤', True),
+    'फ़': (True, 'f', True),
+    'य़': (True, 'ẏ', True),
+    'ॠ': (True, 'ṝ', False),
+    'ॡ': (True, 'ḹ', False),
+    'ॢ': (False, 'ḷ', False),
+    'ॣ': (False, 'ḹ', False),
+    '।': (True, '|', False),
+    '॥': (True, '||', False),
+    '०': (True, '0', False),
+    '१': (True, '1', False),
+    '२': (True, '2', False),
+    '३': (True, '3', False),
+    '४': (True, '4', False),
+    '५': (True, '5', False),
+    '६': (True, '6', False),
+    '७': (True, '7', False),
+    '८': (True, '8', False),
+    '९': (True, '9', False),
+    '᳓': (True, '́', False),
+    '᳙': (True, '̀', False),
+    '᳡': (True, '̀', False),
+    '꣡': (True, '¹', False),
+    '꣢': (True, '²', False),
+    '꣣': (True, '³', False),
+    '꣤': (True, '⁴', False),
+    '꣥': (True, '⁵', False),
+    '꣦': (True, '⁶', False),
+    '꣧': (True, '⁷', False),
+    '꣨': (True, '⁸', False),
+    '꣩': (True, '⁹', False),
+    '꣪': (True, 'ᵃ', False),
+    '꣫': (True, 'ᵘ', False),
+    '꣬': (True, 'ᵏ', False),
+    '꣭': (True, 'ⁿ', False),
+    '꣮': (True, 'ᵖ', False),
+    '꣯': (True, 'ʳ', False),
+    '꣰': (True, 'ᵛ', False),
+    '꣱': (True, 'ˢ', False),
+    'ꣳ': (True, 'm̐', False),
+}
+DEVA_IAST_ACCENTS = ['॑', '॒', '᳓', '᳙', '᳡', '꣡', '꣢', '꣣', '꣤', '꣥', '꣦', '꣧', '꣨', '꣩', '꣪', '꣫', '꣬', '꣭', '꣮', '꣯', '꣰', '꣱']
+IAST_DEVA_TOKENS = {
+    "'": (None, 'ऽ', False),
+    '0': (None, '०', False),
+    '1': (None, '१', False),
+    '2': (None, '२', False),
+    '3': (None, '३', False),
+    '4': (None, '४', False),
+    '5': (None, '५', False),
+    '6': (None, '६', False),
+    '7': (None, '७', False),
+    '8': (None, '८', False),
+    '9': (None, '९', False),
+    'A': ('', 'अ', False),
+    'AI': ('ै', 'ऐ', False),
+    'AU': ('ौ', 'औ', False),
+    'Ai': ('ै', 'ऐ', False),
+    'Au': ('ौ', 'औ', False),
+    'B': (None, 'ब', True),
+    'BH': (None, 'भ', True),
+    'Bh': (None, 'भ', True),
+    'C': (None, 'च', True),
+    'CH': (None, 'छ', True),
+    'Ch': (None, 'छ', True),
+    'D': (None, 'द', True),
+    'DH': (None, 'ध', True),
+    'Dh': (None, 'ध', True),
+    'Ḍ': (None, 'ड', True),
+    'ḌH': (None, 'ढ', True),
+    'Ḍh': (None, 'ढ', True),
+    'E': ('े', 'ए', False),
+    'F': (None, 'फ़', True),
+    'G': (None, 'ग', True),
+    'GH': (None, 'घ', True),
+    'Gh': (None, 'घ', True),
+    'H': (None, 'ह', True),
+    'I': ('ि', 'इ', False),
+    'J': (None, 'ज', True),
+    'JH': (None, 'झ', True),
+    'Jh': (None, 'झ', True),
+    'JÑ': (None, 'ज्ञ', True),
+    'Jñ': (None, 'ज्ञ', True),
+    'K': (None, 'क', True),
+    'KH': (None, 'ख', True),
+    'Kh': (None, 'ख', True),
+    'K͟H': (None, 'ख़', True),
+    'K͟h': (None, 'ख़', True),
+    'KṢ': (None, 'क्ष', True),
+    'Kṣ': (None, 'क्ष', True),
+    'L': (None, 'ल', True),
+    'L̤': (None, 'ऴ', True),
+    'M': (None, 'म', True),
+    'N': (None, 'न', True),
+    'Ñ': (None, 'ञ', True),
+    'Ṅ': (None, 'ङ', True),
+    'Ṇ': (None, 'ण', True),
+    'O': ('ो', 'ओ', False),
+    'P': (None, 'प', True),
+    'PH': (None, 'फ', True),
+    'Ph': (None, 'फ', True),
+    'Q': (None, 'क़', True),
+    'R': (None, 'र', True),
+    'Ṝ': ('ॄ', 'ॠ', False),
+    'R̥̄': ('ॄ', 'ॠ', False),
+    'Ṛ': ('ृ', 'ऋ', False),
+    'Ṝ': ('ॄ', 'ॠ', False),
+    'R̤': (None, 'ड़', True),
+    'R̤H': (None, 'ढ़', True),
+    'R̤h': (None, 'ढ़', True),
+    'R̥': ('ृ', 'ऋ', False),
+    'R̥̄': ('ॄ', 'ॠ', False),
+    'S': (None, 'स', True),
+    'Ṣ': (None, 'ष', True),
+    'T': (None, 'त', True),
+    'TH': (None, 'थ', True),
+    'Th': (None, 'थ', True),
+    'Ṭ': (None, 'ट', True),
+    'ṬH': (None, 'ठ', True),
+    'Ṭh': (None, 'ठ', True),
+    'U': ('ु', 'उ', False),
+    'V': (None, 'व', True),
+    'Y': (None, 'य', True),
+    'Z': (None, 'ज़', True),
+    'a': ('', 'अ', False),
+    'ai': ('ै', 'ऐ', False),
+    'au': ('ौ', 'औ', False),
+    'aì': ('ै᳙', 'ऐ᳙', False),
+    'aí': ('ै᳓', 'ऐ᳓', False),
+    'aù': ('ौ᳙', 'औ᳙', False),
+    'aú': ('ौ᳓', 'औ᳓', False),
+    'b': (None, 'ब', True),
+    'bh': (None, 'भ', True),
+    'c': (None, 'च', True),
+    'ch': (None, 'छ', True),
+    'd': (None, 'द', True),
+    'dh': (None, 'ध', True),
+    'ḍ': (None, 'ड', True),
+    'ḍh': (None, 'ढ', True),
+    'e': ('े', 'ए', False),
+    'f': (None, 'फ़', True),
+    'g': (None, 'ग', True),
+    'gh': (None, 'घ', True),
+    'h': (None, 'ह', True),
+    'ḥ': (None, 'ः', False),
+    'i': ('ि', 'इ', False),
+    'j': (None, 'ज', True),
+    'jh': (None, 'झ', True),
+    'jñ': (None, 'ज्ञ', True),
+    'k': (None, 'क', True),
+    'kh': (None, 'ख', True),
+    'k͟h': (None, 'ख़', True),
+    'kṣ': (None, 'क्ष', True),
+    'l': (None, 'ल', True),
+    'l̤': (None, 'ऴ', True),
+    'm': (None, 'म', True),
+    'ṁ': (None, 'ꣳ', False),
+    'm̐': (None, 'ꣳ', False),
+    'ṃ': (None, 'ं', False),
+    'n': (None, 'न', True),
+    'ñ': (None, 'ञ', True),
+    'ṅ': (None, 'ङ', True),
+    'ṇ': (None, 'ण', True),
+    'o': ('ो', 'ओ', False),
+    'p': (None, 'प', True),
+    'ph': (None, 'फ', True),
+    'q': (None, 'क़', True),
+    'r': (None, 'र', True),
+    'r̥̀': ('ृ᳙', 'ऋ᳙', False),
+    'ṝ': ('ॄ', 'ॠ', False),
+    'r̥̄': ('ॄ', 'ॠ', False),
+    'ṛ': ('ृ', 'ऋ', False),
+    'ṛ̀': ('ृ᳙', 'ऋ᳙', False),
+    'ṝ': ('ॄ', 'ॠ', False),
+    'r̤': (None, 'ड़', True),
+    'r̤h': (None, 'ढ़', True),
+    'r̥': ('ृ', 'ऋ', False),
+    'r̥̄': ('ॄ', 'ॠ', False),
+    's': (None, 'स', True),
+    'ṣ': (None, 'ष', True),
+    't': (None, 'त', True),
+    'th': (None, 'थ', True),
+    'ṭ': (None, 'ट', True),
+    'ṭh': (None, 'ठ', True),
+    'u': ('ु', 'उ', False),
+    'v': (None, 'व', True),
+    'y': (None, 'य', True),
+    'z': (None, 'ज़', True),
+    '|': (None, '।', False),
+    '||': (None, '॥', False),
+    '~': (None, 'ँ', False),
+    '²': (None, '꣢', False),
+    '³': (None, '꣣', False),
+    '¹': (None, '꣡', False),
+    'È': ('ॆ', 'ऎ', False),
+    'Ï': ('ी', 'ई', False),
+    'Ñ': (None, 'ञ', True),
+    'Ò': ('ॊ', 'ऒ', False),
+    'à': ('᳙', 'अ᳙', False),
+    'á': ('᳓', 'अ᳓', False),
+    'è': ('े᳙', 'ए᳙', False),
+    'é': ('े᳓', 'ए᳓', False),
+    'ì': ('ि᳙', 'इ᳙', False),
+    'í': ('ि᳓', 'इ᳓', False),
+    'ï': ('ी', 'ई', False),
+    'ñ': (None, 'ञ', True),
+    'ò': ('ो᳙', 'ओ᳙', False),
+    'ó': ('ो᳓', 'ओ᳓', False),
+    'ù': ('ु᳙', 'उ᳙', False),
+    'ú': ('ु᳓', 'उ᳓', False),
+    'Ā': ('ा', 'आ', False),
+    'ā': ('ा', 'आ', False),
+    'Ġ': (None, 'ग़', True),
+    'ġ': (None, 'ग़', True),
+    'Ī': ('ी', 'ई', False),
+    'ī': ('ी', 'ई', False),
+    'Ś': (None, 'श', True),
+    'ś': (None, 'श', True),
+    'Ū': ('ू', 'ऊ', False),
+    'ū': ('ू', 'ऊ', False),
+    'ʳ': (None, '꣯', False),
+    'ˢ': (None, '꣱', False),
+    '̀': (None, '᳙', False),
+    '́': (None, '᳓', False),
+    '̭': (None, '॑', False),
+    '̱': (None, '॒', False),
+    'ᵃ': (None, '꣪', False),
+    'ᵏ': (None, '꣬', False),
+    'ᵖ': (None, '꣮', False),
+    'ᵘ': (None, '꣫', False),
+    'ᵛ': (None, '꣰', False),
+    'Ḍ': (None, 'ड', True),
+    'ḌH': (None, 'ढ', True),
+    'Ḍh': (None, 'ढ', True),
+    'ḍ': (None, 'ड', True),
+    'ḍh': (None, 'ढ', True),
+    'ḥ': (None, 'ः', False),
+    'Ḷ': ('ॢ', 'ऌ', False),
+    'ḷ': ('ॢ', 'ऌ', False),
+    'Ḹ': ('ॣ', 'ॡ', False),
+    'ḹ': ('ॣ', 'ॡ', False),
+    'Ḻ': (None, 'ळ', True),
+    'ḻ': (None, 'ळ', True),
+    'ṁ': (None, 'ꣳ', False),
+    'ṃ': (None, 'ं', False),
+    'Ṅ': (None, 'ङ', True),
+    'ṅ': (None, 'ङ', True),
+    'Ṇ': (None, 'ण', True),
+    'ṇ': (None, 'ण', True),
+    'Ṉ': (None, 'ऩ', True),
+    'ṉ': (None, 'ऩ', True),
+    'Ṛ': ('ृ', 'ऋ', False),
+    'Ṝ': ('ॄ', 'ॠ', False),
+    'ṛ': ('ृ', 'ऋ', False),
+    'ṝ': ('ॄ', 'ॠ', False),
+    'Ṝ': ('ॄ', 'ॠ', False),
+    'ṝ': ('ॄ', 'ॠ', False),
+    'Ṟ': (None, 'ऱ', True),
+    'ṟ': (None, 'ऱ', True),
+    'Ṣ': (None, 'ष', True),
+    'ṣ': (None, 'ष', True),
+    'Ṭ': (None, 'ट', True),
+    'ṬH': (None, 'ठ', True),
+    'Ṭh': (None, 'ठ', True),
+    'ṭ': (None, 'ट', True),
+    'ṭh': (None, 'ठ', True),
+    'Ẏ': (None, 'य़', True),
+    'ẏ': (None, 'य़', True),
+    '⁴': (None, '꣤', False),
+    '⁵': (None, '꣥', False),
+    '⁶': (None, '꣦', False),
+    '⁷': (None, '꣧', False),
+    '⁸': (None, '꣨', False),
+    '⁹': (None, '꣩', False),
+    'ⁿ': (None, '꣭', False),
+}
+IAST_DEVA_VIRAMA = '्'
+IAST_DEVA_ACCENTS = ['॑', '॒', '᳓', '᳙', '꣡', '꣢', '꣣', '꣤', '꣥', '꣦', '꣧', '꣨', '꣩', '꣪', '꣫', '꣬', '꣭', '꣮', '꣯', '꣰', '꣱']
@@ -0,0 +1,228 @@
+# app/transliteration.py
+"""
+Dedicated Devanagari <-> IAST transliteration.
+
+indic_transliteration's generic `transliterate` re-slices a max-key-length token at every input
+position and lops it down one character at a time, for any of its schemes. We only ever need
+Devanagari -> IAST and IAST -> Devanagari, so translit_tables.py holds those two scheme maps
+flattened into per-token lookup tables; the scanners below split the text into tokens with one
+longest-key-first regex and map each token with a single dict lookup. Output is identical to
+`sanscript.transliterate` (benchmarks/transliteration.py checks that on a large corpus).
+
+Inputs the tables do not replicate fall back to the library, which is imported only then:
+Vedic accent marks (the library reorders them around anusvāra / visarga with a regex) and
+"om" words (the library rewrites a standalone ओं / ओम् to ॐ).
+
+translit_tables.py is generated from the installed library; regenerate it after upgrading
+indic-transliteration with `python -m chandas_analyser.transliteration`. requirements.txt pins the
+version the tables were built from; if a different one is installed anyway, every call goes
+through the library instead (checked once at import from the package metadata, which does not
+import the library).
+"""
+import logging
+import os
+import re
+import sys
+from typing import Dict
+
+from chandas_analyser.translit_tables import (
+    LIBRARY_VERSION, DEVA_IAST_TOKENS, DEVA_IAST_ACCENTS, IAST_DEVA_TOKENS, IAST_DEVA_VIRAMA, IAST_DEVA_ACCENTS,
+)
+
+logger = logging.getLogger("chandas_analyser.transliteration")
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TABLES = os.path.join(CURRENT_DIR, "translit_tables.py")
+
+
+def _trie_pattern(keys) -> str:
+    trie: Dict[str, dict] = {}
+    for key in keys:
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def alternation(node) -> str:
+        branches = []
+        for ch, child in sorted(node.items()):
+            if not ch:
+                continue
+            rest = alternation(child)
+            if not rest:
+                branches.append(re.escape(ch))
+            elif "" in child:
+                branches.append(f"{re.escape(ch)}(?:{rest})?")
+            else:
+                branches.append(f"{re.escape(ch)}(?:{rest})")
+        return "|".join(branches)
+
+    return alternation(trie)
+
+
+def _tokenizer(tokens) -> "re.Pattern[str]":
+    # Multi-character keys as a trie whose optional tails are greedy, so the longest key wins
+    # (the library gets the same token by lopping its max-length slice); else any one character
+    multi = [t for t in tokens if len(t) > 1]
+    return re.compile(f"{_trie_pattern(multi)}|.", re.S)
+
+
+_deva_token_re = _tokenizer(DEVA_IAST_TOKENS)
+_iast_token_re = _tokenizer(IAST_DEVA_TOKENS)
+_deva_accent_re = re.compile("[%s]" % re.escape("".join(DEVA_IAST_ACCENTS)))
+_iast_accent_re = re.compile("[%s]" % re.escape("".join(IAST_DEVA_ACCENTS)))
+# Superset of the library's fix_om match (ओं / ओम् between start / end, whitespace or
+# punctuation): neither neighbour may be a letter, digit or Devanagari sign other than a danda
+_WORD_CHAR = r"[^\W_]"
+_DEVA_SIGN = r"[\u0900-\u0963\u0966-\u096F\u0971-\u097F]"
+_om_re = re.compile(rf"(?<!{_WORD_CHAR})(?<!{_DEVA_SIGN})(?:ओं|ओम्)(?!{_WORD_CHAR}|{_DEVA_SIGN})")
+
+
+def _tables_match_library() -> bool:
+    try:
+        installed = _installed_version()
+    except Exception:
+        # not installed: nothing to fall back to, the tables are all there is
+        return True
+    if installed != LIBRARY_VERSION:
+        logger.warning("Transliteration tables were built from indic-transliteration %s but %s is installed; "
+                       "using the library (regenerate with `python -m chandas_analyser.transliteration`)",
+                       LIBRARY_VERSION, installed)
+        return False
+    return True
+
+
+_USE_TABLES = _tables_match_library()
+
+
+def _library_transliterate(text: str, src: str, dst: str) -> str:
+    from indic_transliteration import sanscript
+    return sanscript.transliterate(text, getattr(sanscript, src), getattr(sanscript, dst))
+
+
+def _scan_devanagari(data: str) -> str:
+    out = []
+    append = out.append
+    had_consonant = False
+    tokens = DEVA_IAST_TOKENS
+    for token in _deva_token_re.findall(data):
+        entry = tokens.get(token)
+        if entry is None:
+            if had_consonant:
+                append("a")
+            append(token)
+            had_consonant = False
+            continue
+        # (ends the inherent vowel?, value, is consonant); vowel signs and virama replace it
+        if had_consonant and entry[0]:
+            append("a")
+        append(entry[1])
+        had_consonant = entry[2]
+    if had_consonant:
+        append("a")
+    return "".join(out)
+
+
+def _scan_iast(data: str) -> str:
+    out = []
+    append = out.append
+    had_consonant = False
+    tokens = IAST_DEVA_TOKENS
+    virama = IAST_DEVA_VIRAMA
+    for token in _iast_token_re.findall(data):
+        entry = tokens.get(token)
+        if entry is None:
+            if had_consonant:
+                append(virama)
+            append(token)
+            had_consonant = False
+            continue
+        # (vowel sign if the token is a vowel, else None; independent form; is consonant)
+        mark, value, is_consonant = entry
+        if had_consonant and mark is not None:
+            append(mark)
+        else:
+            if had_consonant:
+                append(virama)
+            append(value)
+        had_consonant = is_consonant
+    if had_consonant:
+        append(virama)
+    return "".join(out)
+
+
+def devanagari_to_iast(text: str) -> str:
+    """sanscript.transliterate(text, DEVANAGARI, IAST)."""
+    if not _USE_TABLES or _deva_accent_re.search(text):
+        return _library_transliterate(text, "DEVANAGARI", "IAST")
+    return _scan_devanagari(text)
+
+
+def iast_to_devanagari(text: str) -> str:
+    """sanscript.transliterate(text, IAST, DEVANAGARI)."""
+    if not _USE_TABLES:
+        return _library_transliterate(text, "IAST", "DEVANAGARI")
+    result = _scan_iast(text)
+    if _iast_accent_re.search(result) or _om_re.search(result):
+        return _library_transliterate(text, "IAST", "DEVANAGARI")
+    return result
+
+
+# ---------------- table generation ----------------
+def build_tables() -> Dict[str, object]:
+    """Flatten the installed library's DEVANAGARI <-> IAST scheme maps into scanner tables."""
+    import indic_transliteration
+    from indic_transliteration import sanscript
+
+    d2i = sanscript._get_scheme_map(sanscript.DEVANAGARI, sanscript.IAST)
+    # multi-character keys only ever match the non-mark groups; single characters are checked
+    # as vowel sign, then virama, then the rest
+    deva = {t: (True, v, t in d2i.consonants) for t, v in d2i.non_marks_viraama.items()}
+    for group in (d2i.virama, d2i.vowel_marks):
+        deva.update((t, (False, v, t in d2i.consonants)) for t, v in group.items() if len(t) == 1)
+
+    i2d = sanscript._get_scheme_map(sanscript.IAST, sanscript.DEVANAGARI)
+    if not set(i2d.vowels) <= set(i2d.non_marks_viraama):
+        # the scanner assumes every key matches regardless of the preceding consonant
+        raise ValueError("IAST vowels missing from the non-mark groups; the scanner needs updating")
+    iast = {t: (i2d.vowel_marks.get(t, "") if t in i2d.vowels else None, v, t in i2d.consonants)
+            for t, v in i2d.non_marks_viraama.items()}
+
+    return {
+        "LIBRARY_VERSION": getattr(indic_transliteration, "__version__", None) or _installed_version(),
+        "DEVA_IAST_TOKENS": deva,
+        "DEVA_IAST_ACCENTS": sorted(d2i.accents),
+        "IAST_DEVA_TOKENS": iast,
+        "IAST_DEVA_VIRAMA": i2d.virama[""],
+        "IAST_DEVA_ACCENTS": sorted(i2d.accents.values()),
+    }
+
+
+def _installed_version() -> str:
+    from importlib.metadata import version
+    return version("indic-transliteration")
+
+
+def write_tables(path: str = DEFAULT_TABLES) -> None:
+    tables = build_tables()
+    lines = [
+        "# app/translit_tables.py",
+        "# Generated by `python -m chandas_analyser.transliteration` from indic-transliteration "
+        f"{tables['LIBRARY_VERSION']}. Do not edit.",
+        "# fmt: off",
+    ]
+    for name, value in tables.items():
+        if isinstance(value, dict):
+            lines.append(f"{name} = {{")
+            lines.extend(f"    {k!r}: {v!r}," for k, v in sorted(value.items()))
+            lines.append("}")
+        else:
+            lines.append(f"{name} = {value!r}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    logger.info("Wrote transliteration tables for indic-transliteration %s to %s", tables["LIBRARY_VERSION"], path)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    write_tables(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TABLES)
@@ -1,28 +1,37 @@
 import os
+import asyncio
+import json
 import logging
 import re
 from pathlib import Path
 from typing import List, Optional
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+from dotenv import load_dotenv
 
-# Google Auth Imports   
-from google.oauth2 import id_token
-from google.auth.transport import requests
+# Before the project imports: chandas_analyser.config and sloka_generator.jobs read settings
+# from the environment at import time
+load_dotenv()
+
+# Heavy optional dependencies (google-auth, the Gemini generator, indic_transliteration) are
+# imported on first use of their endpoint to keep worker cold start fast; see benchmarks/startup.py
 
 # Analyser imports
 from chandas_analyser.validators import ShlokaIn
 from chandas_analyser.syllabifier import get_lg_pattern, to_devanagari, to_iast
-from chandas_analyser.local_loader import get_chandas_cached
+from chandas_analyser.local_loader import get_chandas_cached, get_chandas_version
 from chandas_analyser.matcher import find_match_in_db
+from chandas_analyser.live import LiveAnalysisSession
+from chandas_analyser.shared_cache import get_shared_cache
+from chandas_analyser.corpus_index import get_corpus_index, MAX_APPEND_VERSES
 
-# Generator import
-from sloka_generator.generator import generate_and_verify
+# Batch generation queue (does not import the generator itself)
+from sloka_generator.jobs import get_job_queue, start_job_workers, stop_job_workers, MAX_JOB_ITEMS, MAX_ITEM_ATTEMPTS
 
 # ---- App setup ----
 logging.basicConfig(level=logging.INFO)
@@ -75,6 +84,9 @@ class LoginRequest(BaseModel):
 
 @app.post("/auth/google")
 async def google_login(login_data: LoginRequest):
+    from google.oauth2 import id_token
+    from google.auth.transport import requests
+
     try:
         idinfo = id_token.verify_oauth2_token(
             login_data.token,
@@ -94,13 +106,19 @@ async def google_login(login_data: LoginRequest):
 @app.on_event("startup")
 async def startup():
     await get_chandas_cached()
+    start_job_workers()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_job_workers()
 
 
 # --- 5. Chandas endpoints ---
 @app.get("/chandas")
 async def get_all_chandas():
     chs = await get_chandas_cached()
-    return JSONResponse({"success": True, "message": "Fetched all Chandas successfully ✅", "data": chs})
+    return JSONResponse({"success": True, "message": "Fetched all Chandas successfully ✅", "data": list(chs)})
 
 
 @app.post("/chandas/analyze")
@@ -109,6 +127,14 @@ async def analyze_chandas(payload: ShlokaIn):
     if not shloka:
         raise HTTPException(status_code=400, detail="Missing shloka text")
 
+    # Load DB (also fixes the DB version used to key the shared cache)
+    db_chandas = await get_chandas_cached()
+    shared_cache = get_shared_cache()
+    if shared_cache is not None:
+        cached = await shared_cache.aget("analyze", shloka, get_chandas_version())
+        if cached is not None:
+            return JSONResponse({"success": True, "message": "Chandas analysis successful ✅", "analysis": cached})
+
     try:
         is_devanagari = bool(re.search(r"[\u0900-\u097F]", shloka))
         devanagari_form = shloka if is_devanagari else to_devanagari(shloka)
@@ -119,41 +145,94 @@ async def analyze_chandas(payload: ShlokaIn):
         combined_compact = "".join(pada_patterns)
         combined_by_pada = "|".join(pada_patterns)
 
-        # Load DB
-        db_chandas = await get_chandas_cached()
-
         # Match and obtain structured result (now includes similarity & matchedPattern)
-        match = find_match_in_db(pada_patterns, db_chandas)
+        match = find_match_in_db(pada_patterns, db_chandas, with_alignment=True)
 
         # Log useful debug info
         logger.info("Analysis input (devanagari present=%s). latin_form=%s", is_devanagari, (latin_form[:80] + "...") if len(str(latin_form))>80 else latin_form)
         logger.info("LG patterns byPada=%s combined=%s", pada_patterns, combined_compact)
         logger.info("Matcher result: %s", match)
 
+        analysis = {
+            "input": {
+                "original": shloka,
+                "devanagari": devanagari_form,
+                "latin": latin_form
+            },
+            "pattern": {
+                "byPada": pada_patterns,
+                "combined_compact": combined_compact,
+                "combined_by_pada": combined_by_pada
+            },
+            "identifiedChandas": match.get("identifiedChandas"),
+            "similarity": match.get("similarity"),
+            "matchedPattern": match.get("matchedPattern"),
+            "explanation": match.get("explanation"),
+            "alignment": match.get("alignment")
+        }
+        if shared_cache is not None:
+            await shared_cache.aset("analyze", shloka, get_chandas_version(), analysis)
+
         return JSONResponse({
             "success": True,
             "message": "Chandas analysis successful ✅",
-            "analysis": {
-                "input": {
-                    "original": shloka,
-                    "devanagari": devanagari_form,
-                    "latin": latin_form
-                },
-                "pattern": {
-                    "byPada": pada_patterns,
-                    "combined_compact": combined_compact,
-                    "combined_by_pada": combined_by_pada
-                },
-                "identifiedChandas": match.get("identifiedChandas"),
-                "similarity": match.get("similarity"),
-                "matchedPattern": match.get("matchedPattern"),
-                "explanation": match.get("explanation")
-            }
+            "analysis": analysis
         })
     except Exception as e:
         logger.exception("Error during chandas analysis")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.websocket("/chandas/live")
+async def live_analyze(websocket: WebSocket):
+    """
+    Incremental analysis for editors. Each message is either
+      {"text": "<full text>"} or {"edit": {"start": int, "end": int, "text": "<inserted>"}}
+    with an optional "rev" the client can use to discard stale replies.
+    Only changed padas are re-syllabified and re-scored.
+    """
+    await websocket.accept()
+    session = LiveAnalysisSession()
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            rev = text = None
+            try:
+                msg = json.loads(raw)
+                if not isinstance(msg, dict):
+                    raise ValueError("Invalid message: expected a JSON object.")
+                rev = msg.get("rev")
+                if "edit" in msg:
+                    edit = msg["edit"] or {}
+                    if not isinstance(edit, dict):
+                        raise ValueError("Invalid edit: expected an object with 'start', 'end' and 'text'.")
+                    text = session.apply_edit(edit.get("start", 0), edit.get("end", 0), edit.get("text", ""))
+                else:
+                    text = msg.get("text", "")
+                    if not isinstance(text, str):
+                        raise ValueError("Invalid input: 'text' must be provided as a string.")
+                # Same validation as /chandas/analyze, but an empty editor is not an error.
+                # The session keeps the raw text so client edit offsets stay valid.
+                try:
+                    cleaned = ShlokaIn(shloka=text).shloka if text.strip() else ""
+                except ValidationError as e:
+                    raise ValueError(e.errors()[0]["msg"])
+
+                db_chandas = await get_chandas_cached()
+                analysis = session.update(text, db_chandas, analyzed_text=cleaned)
+                reply = {"success": True, "rev": rev, "analysis": analysis}
+            except (ValueError, TypeError) as e:
+                reply = {"success": False, "rev": rev, "error": str(e)}
+            except Exception:
+                logger.exception("Error during live analysis")
+                reply = {"success": False, "rev": rev, "error": "Analysis failed."}
+            if not reply["success"] and text is not None:
+                # the editor already holds this text; later edits are offsets into it
+                session.keep_text(text)
+            await websocket.send_json(reply)
+    except WebSocketDisconnect:
+        logger.info("Live analysis client disconnected after %d revisions", session.revision)
+
+
 class GenRequest(BaseModel):
     chandas: str
     context: str
@@ -162,6 +241,8 @@ class GenRequest(BaseModel):
 
 @app.post("/generate-and-verify")
 async def generate_and_verify_route(req: GenRequest):
+    from sloka_generator.generator import generate_and_verify
+
     try:
         result = await generate_and_verify(req.chandas, req.context, req.language, req.max_attempts)
         return JSONResponse(result)
@@ -170,6 +251,123 @@ async def generate_and_verify_route(req: GenRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# --- 6. Batch generation jobs ---
+class GenJobRequest(BaseModel):
+    items: List[GenRequest]
+
+
+@app.post("/jobs")
+async def submit_generation_job(req: GenJobRequest):
+    """Queue many generation specs; they are processed in the background by the job workers."""
+    if not req.items:
+        raise HTTPException(status_code=400, detail="Job needs at least one item")
+    if len(req.items) > MAX_JOB_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Job too large: please limit it to {MAX_JOB_ITEMS} items.")
+    if any(item.max_attempts is not None and not 1 <= item.max_attempts <= MAX_ITEM_ATTEMPTS for item in req.items):
+        raise HTTPException(status_code=400, detail=f"Job items allow 1 to {MAX_ITEM_ATTEMPTS} attempts each.")
+    specs = [item.dict() for item in req.items]
+    job_id = await asyncio.to_thread(get_job_queue().submit, specs)
+    return {"success": True, "jobId": job_id, "total": len(specs)}
+
+
+@app.get("/jobs/{job_id}")
+async def get_generation_job(job_id: str, include_results: bool = True):
+    progress = await asyncio.to_thread(get_job_queue().progress, job_id, include_results)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"success": True, **progress}
+
+
+@app.get("/jobs/{job_id}/events")
+async def stream_generation_job(job_id: str):
+    """Server-sent events: a 'progress' event whenever the counts change, then 'completed'."""
+    queue = get_job_queue()
+    if await asyncio.to_thread(queue.progress, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        last = None
+        while True:
+            progress = await asyncio.to_thread(queue.progress, job_id)
+            if progress != last:
+                yield f"event: progress\ndata: {json.dumps(progress, ensure_ascii=False)}\n\n"
+                last = progress
+            if progress["status"] == "completed":
+                final = await asyncio.to_thread(queue.progress, job_id, True)
+                yield f"event: completed\ndata: {json.dumps(final, ensure_ascii=False)}\n\n"
+                return
+            await asyncio.sleep(1.0)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+# --- 7. Corpus index ---
+class CorpusVerse(BaseModel):
+    id: str
+    text: str
+
+class CorpusAppend(BaseModel):
+    verses: List[CorpusVerse]
+
+
+def _analyze_corpus_verses(verses: List[CorpusVerse], db_chandas) -> List[dict]:
+    records = []
+    for v in verses:
+        try:
+            text = ShlokaIn(shloka=v.text).shloka
+        except ValidationError as e:
+            raise ValueError(f"Verse '{v.id}': {e.errors()[0]['msg']}")
+        pada_patterns = get_lg_pattern(text)
+        match = find_match_in_db(pada_patterns, db_chandas)
+        records.append({"verse_id": v.id, "text": text, "padas": pada_patterns,
+                        "meter": match.get("identifiedChandas")})
+    return records
+
+
+@app.post("/corpus/verses")
+async def corpus_append(payload: CorpusAppend):
+    """Analyze verses once and append them (by id; re-sent ids are replaced) to the corpus index."""
+    if len(payload.verses) > MAX_APPEND_VERSES:
+        raise HTTPException(status_code=400, detail=f"Batch too large: please limit it to {MAX_APPEND_VERSES} verses.")
+    db_chandas = await get_chandas_cached()
+    try:
+        records = await asyncio.to_thread(_analyze_corpus_verses, payload.verses, db_chandas)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        added = await asyncio.to_thread(get_corpus_index().add_verses, records)
+    except Exception as e:
+        logger.exception("Error while indexing corpus verses")
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"success": True, "indexed": added}
+
+
+@app.get("/corpus/search")
+async def corpus_search(meter: Optional[str] = None, pattern: Optional[str] = None, k: int = 0,
+                        limit: int = 100, offset: int = 0):
+    """Verses in a meter and/or containing LG pada pattern(s) ('|'-separated) within edit distance k."""
+    try:
+        found = await asyncio.to_thread(get_corpus_index().search, meter, pattern, k,
+                                        max(1, min(limit, 1000)), max(0, offset))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, **found}
+
+
+@app.get("/corpus/stats")
+async def corpus_stats():
+    return await asyncio.to_thread(get_corpus_index().stats)
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    shared_cache = get_shared_cache()
+    if shared_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **(await asyncio.to_thread(shared_cache.stats))}
+
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
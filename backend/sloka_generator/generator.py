@@ -1,23 +1,14 @@
 # sloka_generator/generator.py
 import os
-import httpx
 import json
 import re
 import asyncio
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 
 from dotenv import load_dotenv
 
-# try to import official SDK; if missing fall back later
-try:
-    import google.generativeai as genai
-    _HAS_GENAI = True
-except Exception:
-    genai = None
-    _HAS_GENAI = False
-
 # analyser imports (these must be available in your project)
 try:
     from chandas_analyser.syllabifier import get_lg_pattern, to_iast, to_devanagari
@@ -27,7 +18,7 @@ try:
 except Exception:
     # graceful fallback: keep file importable for testing
     get_lg_pattern = lambda x: []
-    find_match_in_db = lambda x, y: {}
+    find_match_in_db = lambda x, y, **kw: {}
     async def get_chandas_cached(): return []
     SIMILARITY_THRESHOLD = 0.7
 
@@ -45,8 +36,22 @@ TIMEOUT = 30.0
 logger = logging.getLogger("sloka_generator")
 logging.basicConfig(level=logging.INFO)
 
-# Configure SDK if available
-if _HAS_GENAI:
+# SDK configuration is deferred to the first generation (google.generativeai is slow to import)
+_sdk_configured = False
+
+def _configure_sdk() -> None:
+    """Import and configure the official SDK once, if available."""
+    global _sdk_configured
+    if _sdk_configured:
+        return
+    _sdk_configured = True
+
+    # try to import official SDK; if missing fall back to the REST call below
+    try:
+        import google.generativeai as genai
+    except Exception:
+        return
+
     if not GEMINI_API_KEY:
         logger.warning("GEMINI_API_KEY not set; generator will fail until set.")
     else:
@@ -136,6 +141,31 @@ def extract_shloka_and_meta(generated_text: str) -> Dict[str, str]:
 
     return {"shloka": shloka, "meta": meta, "raw": generated_text}
 
+def describe_mismatches(match: Dict[str, Any], chandas_name: str, max_items: int = 8) -> str:
+    """
+    Turn the matcher's alignment (edit script vs the best candidate) into a one-line retry hint.
+    Only used when the best candidate is the requested meter; otherwise positions would be misleading.
+    """
+    alignment = match.get("alignment") or {}
+    if (alignment.get("against") or "").lower() != chandas_name.lower():
+        return ""
+    weight = {"L": "Laghu", "G": "Guru"}
+    notes = []
+    inserted: Dict[Tuple[int, int], int] = {}   # (pada, pos) -> syllables already added there
+    for e in alignment.get("edits", [])[:max_items]:
+        where = f"pāda {e['pada'] + 1}, syllable {e['pos'] + 1}"
+        if e["op"] == "sub":
+            notes.append(f"{where} must be {weight.get(e['expected'], e['expected'])}")
+        elif e["op"] == "del":
+            notes.append(f"{where} is one syllable too many")
+        else:
+            key = (e["pada"], e["pos"])
+            at = e["pos"] + 1 + inserted.get(key, 0)
+            inserted[key] = inserted.get(key, 0) + 1
+            kind = f"a {weight[e['expected']]} syllable" if e["expected"] in weight else "a syllable"
+            notes.append(f"pāda {e['pada'] + 1} is missing {kind} at position {at}")
+    return "; ".join(notes)
+
 # ---------------- SDK wrapper ----------------
 
 
@@ -148,6 +178,8 @@ async def _generate_with_sdk_async(prompt: str) -> str:
     Use Google Generative Language REST endpoint via httpx.
     Returns the generated text (string) or raises RuntimeError on failure.
     """
+    import httpx
+
     if not GEMINI_API_KEY:
         raise RuntimeError("GEMINI_API_KEY is not set in environment (.env).")
 
@@ -217,6 +249,8 @@ async def generate_and_verify(chandas_name: str, context: str, language: str="de
     - Logs raw model output, parsed shloka, LG patterns and match for debugging.
     - Retries with progressively stricter prompt if mismatch occurs.
     """
+    _configure_sdk()
+
     # load DB
     try:
         db = await get_chandas_cached()
@@ -231,6 +265,7 @@ async def generate_and_verify(chandas_name: str, context: str, language: str="de
         extra_instructions = f"Canonical LG pattern (for guidance): {pat}"
 
     attempts = []
+    mismatch_hint = ""
     ACCEPT_NEAR_THRESHOLD = float(os.getenv("ACCEPT_NEAR_THRESHOLD", "0.62"))  # soft accept threshold (optional)
     # deterministic guidance
     gen_opts = {
@@ -247,6 +282,8 @@ async def generate_and_verify(chandas_name: str, context: str, language: str="de
         # If not first attempt, add stricter instruction
         if attempt > 1:
             prompt += "\nNOTE: Previous attempt did not match the meter. THIS TIME strictly follow the meter exactly and output NOTHING but the required fenced blocks."
+            if mismatch_hint:
+                prompt += f"\nPrevious attempt broke the meter here: {mismatch_hint}."
 
         # call the low-level generator
         try:
@@ -282,7 +319,7 @@ async def generate_and_verify(chandas_name: str, context: str, language: str="de
 
         # Analyze produced shloka
         lg_patterns = get_lg_pattern(shloka_text)
-        match = find_match_in_db(lg_patterns, db)
+        match = find_match_in_db(lg_patterns, db, with_alignment=True)
 
         attempt_record = {
             "attempt": attempt,
@@ -313,7 +350,8 @@ async def generate_and_verify(chandas_name: str, context: str, language: str="de
             logger.info("Generation SUCCESS on attempt %d: identified=%s similarity=%.3f", attempt, match.get("identifiedChandas"), similarity)
             return {"success": True, "attempts": attempts, "final": attempt_record}
 
-        # Otherwise tighten instructions and retry (loop continues)
+        # Otherwise tighten instructions (pointing at the offending syllables) and retry
+        mismatch_hint = describe_mismatches(match, chandas_name)
         logger.info("Attempt %d did not pass verification: identified=%s similarity=%.3f", attempt, match.get("identifiedChandas"), similarity)
 
     # After all attempts, return failure plus all attempts for debugging
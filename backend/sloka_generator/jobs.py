@@ -0,0 +1,283 @@
+# sloka_generator/jobs.py
+"""
+Background batch generation.
+
+Jobs (lists of (chandas, context, language, max_attempts) specs) are persisted in a local SQLite
+queue, so they survive restarts and are shared by every uvicorn worker. Each worker process runs a
+bounded pool of async consumers that claim one item at a time with a lease and call
+generate_and_verify; items whose lease expires (e.g. the process died mid-generation) are claimed
+again, up to JOB_MAX_ATTEMPTS times before they are marked failed. Each claim gets a fresh lease
+token and only the current holder may renew the lease (a heartbeat while the item runs) or record a
+result, so a worker whose lease expired cannot overwrite the retry's. Items interrupted by a
+shutdown are handed back to the queue without using up an attempt. Progress and results are read
+back from the same tables.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from chandas_analyser.sqlite_store import open_wal_db
+
+logger = logging.getLogger("sloka_generator.jobs")
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", str(Path(__file__).resolve().parent.parent / "generation_jobs.sqlite3"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))         # concurrent generations per process
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "600"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_POLL_SECONDS = 1.0
+JOB_HEARTBEAT_SECONDS = JOB_LEASE_SECONDS / 4
+MAX_JOB_ITEMS = 1000
+# Each generation attempt is one Gemini call of up to generator.TIMEOUT (30 s, not imported: the
+# generator is loaded on first use); an item's attempts must fit in one lease even without heartbeats
+MAX_ITEM_ATTEMPTS = max(1, int(JOB_LEASE_SECONDS // 30.0) - 1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id         TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    total      INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id       TEXT NOT NULL,
+    idx          INTEGER NOT NULL,
+    spec         TEXT NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'pending',   -- pending | running | done | failed
+    lease_until  REAL,
+    lease_token  TEXT,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    result       TEXT,
+    updated_at   REAL NOT NULL,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS job_items_queue ON job_items (status, lease_until);
+"""
+
+
+class JobQueue:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = open_wal_db(path, _SCHEMA)
+        # queues created before attempts / lease tokens existed
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(job_items)")}
+        if "lease_token" not in columns:
+            self._conn.execute("ALTER TABLE job_items ADD COLUMN lease_token TEXT")
+        if "attempts" not in columns:
+            self._conn.execute("ALTER TABLE job_items ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+
+    def submit(self, specs: List[Dict[str, Any]]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("INSERT INTO jobs (id, created_at, total) VALUES (?, ?, ?)", (job_id, now, len(specs)))
+                self._conn.executemany(
+                    "INSERT INTO job_items (job_id, idx, spec, updated_at) VALUES (?, ?, ?, ?)",
+                    [(job_id, i, json.dumps(spec, ensure_ascii=False), now) for i, spec in enumerate(specs)])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        logger.info("Queued generation job %s with %d items", job_id, len(specs))
+        return job_id
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Lease the oldest pending (or lease-expired running) item, or return None.
+        Expired items that already used JOB_MAX_ATTEMPTS claims are marked failed instead.
+        """
+        now = time.time()
+        token = uuid.uuid4().hex
+        with self._lock:
+            # Idle consumers poll every second in every process: look before taking the write lock
+            if self._conn.execute(
+                    "SELECT 1 FROM job_items WHERE status = 'pending' OR (status = 'running' AND lease_until < ?) "
+                    "LIMIT 1", (now,)).fetchone() is None:
+                return None
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                given_up = json.dumps({"success": False, "error": f"Gave up after {JOB_MAX_ATTEMPTS} attempts"})
+                self._conn.execute(
+                    "UPDATE job_items SET status = 'failed', result = ?, lease_until = NULL, lease_token = NULL, "
+                    "updated_at = ? WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                    (given_up, now, now, JOB_MAX_ATTEMPTS))
+                row = self._conn.execute(
+                    "SELECT i.job_id, i.idx, i.spec FROM job_items i JOIN jobs j ON j.id = i.job_id "
+                    "WHERE i.status = 'pending' OR (i.status = 'running' AND i.lease_until < ?) "
+                    "ORDER BY j.created_at, i.idx LIMIT 1", (now,)).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE job_items SET status = 'running', lease_until = ?, lease_token = ?, attempts = attempts + 1, "
+                        "updated_at = ? WHERE job_id = ? AND idx = ?",
+                        (now + JOB_LEASE_SECONDS, token, now, row[0], row[1]))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return {"job_id": row[0], "idx": row[1], "spec": json.loads(row[2]), "lease_token": token}
+
+    def renew(self, job_id: str, idx: int, lease_token: str) -> bool:
+        """Extend the lease of a running item; returns False if 'lease_token' no longer holds it."""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE job_items SET lease_until = ? WHERE job_id = ? AND idx = ? AND status = 'running' AND lease_token = ?",
+                (time.time() + JOB_LEASE_SECONDS, job_id, idx, lease_token))
+        return cur.rowcount == 1
+
+    def release(self, job_id: str, idx: int, lease_token: str) -> bool:
+        """Hand an interrupted item back to the queue and give back the attempt its claim used."""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE job_items SET status = 'pending', lease_until = NULL, lease_token = NULL, "
+                "attempts = MAX(attempts - 1, 0), updated_at = ? "
+                "WHERE job_id = ? AND idx = ? AND status = 'running' AND lease_token = ?",
+                (time.time(), job_id, idx, lease_token))
+        return cur.rowcount == 1
+
+    def finish(self, job_id: str, idx: int, lease_token: str, result: Dict[str, Any], failed: bool) -> bool:
+        """Record the result if 'lease_token' still holds the item's lease; returns False if it was lost."""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE job_items SET status = ?, result = ?, lease_until = NULL, lease_token = NULL, updated_at = ? "
+                "WHERE job_id = ? AND idx = ? AND status = 'running' AND lease_token = ?",
+                ("failed" if failed else "done", json.dumps(result, ensure_ascii=False), time.time(), job_id, idx,
+                 lease_token))
+        return cur.rowcount == 1
+
+    def progress(self, job_id: str, include_results: bool = False) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._conn.execute("SELECT created_at, total FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)).fetchall())
+            items = None
+            if include_results:
+                items = self._conn.execute(
+                    "SELECT idx, spec, status, result FROM job_items WHERE job_id = ? ORDER BY idx", (job_id,)).fetchall()
+
+        created_at, total = job
+        finished = counts.get("done", 0) + counts.get("failed", 0)
+        if finished == total:
+            status = "completed"
+        elif finished or counts.get("running"):
+            status = "running"
+        else:
+            status = "queued"
+        out = {
+            "jobId": job_id,
+            "status": status,
+            "createdAt": created_at,
+            "total": total,
+            "pending": counts.get("pending", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0)
+        }
+        if items is not None:
+            out["items"] = [{"index": idx, "spec": json.loads(spec), "status": st, "result": json.loads(res) if res else None}
+                            for idx, spec, st, res in items]
+        return out
+
+
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue(JOBS_DB_PATH)
+    return _job_queue
+
+
+# ---------------- worker pool ----------------
+async def _keep_lease(item: Dict[str, Any], generation: asyncio.Task) -> bool:
+    """Renew the item's lease until cancelled; if it is lost, stop the generation and return False."""
+    queue = get_job_queue()
+    while True:
+        await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+        try:
+            held = await asyncio.to_thread(queue.renew, item["job_id"], item["idx"], item["lease_token"])
+        except Exception:
+            logger.exception("Job %s item %d: could not renew its lease", item["job_id"], item["idx"])
+            continue
+        if not held:
+            generation.cancel()
+            return False
+
+
+async def _run_item(item: Dict[str, Any]) -> None:
+    from sloka_generator.generator import generate_and_verify, DEFAULT_MAX_ATTEMPTS
+
+    spec = item["spec"]
+    key = (item["job_id"], item["idx"], item["lease_token"])
+    generation = asyncio.create_task(generate_and_verify(
+        spec["chandas"], spec["context"], spec.get("language") or "devanagari",
+        min(spec.get("max_attempts") or DEFAULT_MAX_ATTEMPTS, MAX_ITEM_ATTEMPTS)))
+    heartbeat = asyncio.create_task(_keep_lease(item, generation))
+    try:
+        result = await generation
+        failed = not result.get("success")
+    except asyncio.CancelledError:
+        if heartbeat.done() and not heartbeat.cancelled() and heartbeat.result() is False:
+            logger.warning("Job %s item %d: lease lost while running; generation stopped", item["job_id"], item["idx"])
+            return
+        # Shutdown: hand the item back now instead of leaving it 'running' until the lease expires
+        try:
+            get_job_queue().release(*key)
+        except Exception:
+            logger.exception("Job %s item %d: could not release its lease", item["job_id"], item["idx"])
+        raise
+    except Exception as e:
+        logger.exception("Job %s item %d crashed", item["job_id"], item["idx"])
+        result, failed = {"success": False, "error": str(e)}, True
+    finally:
+        heartbeat.cancel()
+    recorded = await asyncio.to_thread(get_job_queue().finish, *key, result, failed)
+    if not recorded:
+        logger.warning("Job %s item %d: lease expired before it finished; result discarded", item["job_id"], item["idx"])
+
+
+async def _worker_loop(n: int) -> None:
+    queue = get_job_queue()
+    while True:
+        # Any error (e.g. "database is locked" from claim or finish) must not end this consumer
+        try:
+            item = await asyncio.to_thread(queue.claim)
+            if item is None:
+                await asyncio.sleep(JOB_POLL_SECONDS)
+                continue
+            logger.info("Job worker %d running job %s item %d", n, item["job_id"], item["idx"])
+            await _run_item(item)
+        except Exception:
+            logger.exception("Job worker %d hit an error; continuing", n)
+            await asyncio.sleep(JOB_POLL_SECONDS)
+
+
+_worker_tasks: List[asyncio.Task] = []
+
+
+def start_job_workers(count: int = JOB_WORKERS) -> None:
+    """Start the per-process consumer pool (idempotent)."""
+    if _worker_tasks:
+        return
+    for n in range(count):
+        _worker_tasks.append(asyncio.create_task(_worker_loop(n)))
+    logger.info("Started %d generation job workers", count)
+
+
+async def stop_job_workers() -> None:
+    # Interrupted items are released back to 'pending' by _run_item
+    for task in _worker_tasks:
+        task.cancel()
+    await asyncio.gather(*_worker_tasks, return_exceptions=True)
+    _worker_tasks.clear()